@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Benchmark every build stage on synthetic sites, e.g. ./bench.sh --output results.json
+python3 bench/run_benchmarks.py "$@"
@@ -0,0 +1,89 @@
+"""
+Compare the single-pass block tokenizer against the old
+markdown_to_blocks + block_to_block_type + splitlines path. The old path
+uses a copy of the regex-based block_to_block_type it replaced, since the
+one in block_type.py has been sped up since.
+
+Usage: python3 bench/bench_block_tokenizer.py [blocks] [repeat]
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from block_parser import markdown_to_blocks  # noqa: E402
+from block_tokenizer import tokenize_blocks  # noqa: E402
+from block_type import BlockType  # noqa: E402
+
+SAMPLE_BLOCKS = [
+    "## Section heading",
+    "A paragraph with **bold** and _italic_ text\nthat continues on a second line\nand a third.",
+    "- first item\n- second item\n- third item\n- fourth item",
+    "1. one\n2. two\n3. three\n4. four\n5. five",
+    "> a quote\n> spanning lines",
+    "```\ndef f(x):\n    return x * 2\n```",
+]
+
+
+def make_document(blocks: int) -> str:
+    return "\n\n".join(SAMPLE_BLOCKS[i % len(SAMPLE_BLOCKS)] for i in range(blocks))
+
+
+def old_block_to_block_type(block: str) -> BlockType:
+    # block_to_block_type as it was before the tokenizer
+    if re.match(r"^#{1,6} ", block):
+        return BlockType.HEADING
+    elif re.match(r"^```[\s\S]*```$", block):
+        return BlockType.CODE
+    else:
+        lines = block.splitlines()
+        if lines and all(line.startswith(">") for line in lines):
+            return BlockType.QUOTE
+        elif lines and all(re.match(r"^- ", line) for line in lines):
+            return BlockType.UNORDERED_LIST
+        elif old_is_ordered_list_block(block):
+            return BlockType.ORDERED_LIST
+        else:
+            return BlockType.PARAGRAPH
+
+
+def old_is_ordered_list_block(block: str) -> bool:
+    lines = block.strip().splitlines()
+    if not lines:
+        return False
+    for i, line in enumerate(lines):
+        if not re.match(rf"^{i+1}\. ", line):
+            return False
+    return True
+
+
+def old_path(markdown: str) -> list:
+    return [
+        (old_block_to_block_type(block), block.splitlines())
+        for block in markdown_to_blocks(markdown)
+    ]
+
+
+def new_path(markdown: str) -> list:
+    return list(tokenize_blocks(markdown))
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    markdown = make_document(blocks)
+    print(f"{blocks} blocks, {len(markdown) / 1e6:.1f} MB, best of {repeat}")
+
+    results = {}
+    for name, fn in (("old", old_path), ("tokenizer", new_path)):
+        best = min(timeit.repeat(lambda: fn(markdown), number=1, repeat=repeat))
+        results[name] = best
+        print(f"  {name:<10} {best * 1000:8.1f} ms")
+    print(f"  speedup    {results['old'] / results['tokenizer']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare the single-scan text_to_textnodes against the chained
+split_nodes_* passes it replaced, on long paragraphs.
+
+Usage: python3 bench/bench_inline_parser.py [sentences] [repeat]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from inline_parser import (  # noqa: E402
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType  # noqa: E402
+
+SENTENCES = [
+    "Plain prose without any markup at all, just words and punctuation.",
+    "Some **bold words** and some _italic words_ mixed in.",
+    "A [link to somewhere](https://example.com/page) in the middle.",
+    "Inline `code()` and an ![image](/images/a.png) as well.",
+]
+
+
+def chained_passes(text: str) -> list[TextNode]:
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    return [n for n in nodes if not (n.text == "" and n.text_type == TextType.TEXT)]
+
+
+def main():
+    sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    text = " ".join(SENTENCES[i % len(SENTENCES)] for i in range(sentences))
+    assert chained_passes(text) == text_to_textnodes(text)
+    print(f"paragraph of {sentences} sentences ({len(text) / 1e3:.0f} kB), best of {repeat}")
+
+    results = {}
+    for name, fn in (("chained", chained_passes), ("scanner", text_to_textnodes)):
+        best = min(timeit.repeat(lambda: fn(text), number=1, repeat=repeat))
+        results[name] = best
+        print(f"  {name:<8} {best * 1000:8.2f} ms")
+    print(f"  speedup  {results['chained'] / results['scanner']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
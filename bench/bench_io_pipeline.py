@@ -0,0 +1,92 @@
+"""
+Compare serial generate_pages_recursive against the threaded I/O
+pipeline (io_threads) on a cold page cache.
+
+Before every run the sources are evicted from the OS page cache with
+posix_fadvise where the platform supports it. --latency adds a fixed
+delay to every file open in page_generator, to mimic a network-mounted
+build volume.
+
+Usage: python3 bench/bench_io_pipeline.py [--pages N] [--threads 1,4,8]
+    [--latency MS] [--repeat N]
+"""
+
+import argparse
+import builtins
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import page_generator  # noqa: E402
+from content_gen import generate_site  # noqa: E402
+
+
+def evict(paths) -> bool:
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def slow_open(latency):
+    def open_with_latency(*args, **kwargs):
+        time.sleep(latency)
+        return builtins.open(*args, **kwargs)
+
+    return open_with_latency
+
+
+def run(site, sources, io_threads, repeat) -> float:
+    content = os.path.join(site, "content")
+    template = os.path.join(site, "template.html")
+    dest = os.path.join(site, "out")
+    best = float("inf")
+    for _ in range(repeat):
+        shutil.rmtree(dest, ignore_errors=True)
+        evict(sources)
+        start = time.perf_counter()
+        page_generator.generate_pages_recursive(
+            content, template, dest, "/", io_threads=io_threads
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--threads", default="1,4,8")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site:
+        sources = generate_site("small", site, args.pages)
+        cold = "cold cache" if evict(sources) else "warm cache (no posix_fadvise)"
+        print(f"{len(sources)} pages, {cold}, {args.latency:g} ms open latency")
+        if args.latency:
+            page_generator.open = slow_open(args.latency / 1000)
+        try:
+            serial = run(site, sources, 0, args.repeat)
+            print(f"  serial       {serial * 1000:8.1f} ms")
+            for threads in (int(n) for n in args.threads.split(",")):
+                seconds = run(site, sources, threads, args.repeat)
+                print(
+                    f"  {threads:>2} threads   {seconds * 1000:8.1f} ms"
+                    f"  {serial / seconds:5.2f}x"
+                )
+        finally:
+            vars(page_generator).pop("open", None)
+
+
+if __name__ == "__main__":
+    main()
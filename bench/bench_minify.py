@@ -0,0 +1,71 @@
+"""
+Weigh --minify-html: the one-off cost of minifying the template and the
+render time per page against the bytes it saves per page. For scale, also
+time minifying every finished page instead, which the build does not do.
+
+Usage: python3 bench/bench_minify.py [pages] [repeat]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from content_gen import generate_site  # noqa: E402
+from html_minifier import minify_html  # noqa: E402
+from markdown_to_html import markdown_to_html_node  # noqa: E402
+from template import Template  # noqa: E402
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as site:
+        sources = generate_site("small", site, pages)
+        contents = []
+        for path in sources:
+            with open(path) as f:
+                contents.append(markdown_to_html_node(f.read()).to_html())
+        with open(os.path.join(site, "template.html")) as f:
+            text = f.read()
+
+    plain = Template(text, "/ssg/")
+    minified = Template(text, "/ssg/", minify=True)
+
+    def render(template):
+        return [template.render("Title", html) for html in contents]
+
+    def best(fn) -> float:
+        return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+    compile_cost = best(lambda: Template(text, "/ssg/", minify=True)) - best(
+        lambda: Template(text, "/ssg/")
+    )
+    plain_pages = render(plain)
+    plain_bytes = sum(len(page.encode()) for page in plain_pages)
+    minified_bytes = sum(len(page.encode()) for page in render(minified))
+    saved = (plain_bytes - minified_bytes) / pages
+
+    per_page = {
+        "render, plain template": best(lambda: render(plain)),
+        "render, minified template": best(lambda: render(minified)),
+        "minifying each page instead": best(
+            lambda: [minify_html(page) for page in plain_pages]
+        ),
+    }
+
+    print(f"{pages} pages, best of {repeat}")
+    print(f"  {'template minified once':<30}{compile_cost * 1e6:10.1f} us per build")
+    for label, seconds in per_page.items():
+        print(f"  {label:<30}{seconds / pages * 1e6:10.2f} us/page")
+    print(
+        f"  {'saved per page':<30}{saved:10.0f} B "
+        f"({saved * pages / plain_bytes:.1%} of {plain_bytes / pages:.0f} B)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measure the memory held by the TextNode and HTMLNode objects of a large
+generated document, using tracemalloc, and compare the slotted node
+classes against copies of them that keep their attributes in a __dict__.
+
+Usage: python3 bench/bench_node_memory.py [blocks]
+"""
+
+import os
+import sys
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from htmlnode import HTMLNode, LeafNode, ParentNode  # noqa: E402
+from inline_parser import text_to_textnodes  # noqa: E402
+from markdown_to_html import markdown_to_html_node  # noqa: E402
+from textnode import TextNode  # noqa: E402
+
+SAMPLE_BLOCKS = [
+    "## Section heading",
+    "A paragraph with **bold**, _italic_ and `code`, plus a [link](/somewhere).",
+    "- first item\n- second **item**\n- third item\n- fourth item",
+    "1. one\n2. two\n3. three",
+]
+
+
+def make_document(blocks: int) -> str:
+    return "\n\n".join(SAMPLE_BLOCKS[i % len(SAMPLE_BLOCKS)] for i in range(blocks))
+
+
+def unslotted(cls, bases=(object,)):
+    """A copy of cls, on bases, whose instances keep a __dict__ instead of slots."""
+    namespace = {
+        name: value
+        for name, value in vars(cls).items()
+        if name not in ("__slots__", "__dict__", "__weakref__")
+        and not isinstance(value, types.MemberDescriptorType)
+    }
+    return type(f"Dict{cls.__name__}", bases, namespace)
+
+
+DictHTMLNode = unslotted(HTMLNode)
+DictLeafNode = unslotted(LeafNode, (DictHTMLNode,))
+DictParentNode = unslotted(ParentNode, (DictHTMLNode,))
+DictTextNode = unslotted(TextNode)
+
+
+def copy_tree(node, leaf_cls, parent_cls):
+    if isinstance(node, (ParentNode, DictParentNode)):
+        children = [copy_tree(child, leaf_cls, parent_cls) for child in node.children]
+        return parent_cls(node.tag, children, node.props)
+    return leaf_cls(node.tag, node.value, node.props)
+
+
+def count_nodes(node) -> int:
+    if isinstance(node, ParentNode):
+        return 1 + sum(count_nodes(child) for child in node.children)
+    return 1
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def compare(nodes, copy_slotted, copy_dict) -> None:
+    """Print the memory of copies made with each class, and the difference."""
+    held = {}
+    for label, copy in (("slots", copy_slotted), ("__dict__", copy_dict)):
+        _, current, _ = measure(copy)
+        held[label] = current
+        print(f"    {label:<8} {current / 1e6:6.1f} MB, {current / nodes:4.0f} B/node")
+    saved = held["__dict__"] - held["slots"]
+    print(f"    slots save {saved / 1e6:.1f} MB, {saved / nodes:.0f} B/node")
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    markdown = make_document(blocks)
+    paragraph = " ".join(SAMPLE_BLOCKS[1] for _ in range(blocks))
+    print(f"{blocks} blocks, {len(markdown) / 1e6:.1f} MB of markdown")
+
+    tree, current, peak = measure(lambda: markdown_to_html_node(markdown))
+    nodes = count_nodes(tree)
+    print(
+        f"  HTMLNode tree: {nodes} nodes, {current / 1e6:.1f} MB held, "
+        f"{peak / 1e6:.1f} MB peak, {current / nodes:.0f} B/node"
+    )
+    # The copies share the strings and props, so only the nodes and the
+    # children lists are counted
+    compare(
+        nodes,
+        lambda: copy_tree(tree, LeafNode, ParentNode),
+        lambda: copy_tree(tree, DictLeafNode, DictParentNode),
+    )
+
+    text_nodes, current, peak = measure(lambda: text_to_textnodes(paragraph))
+    print(
+        f"  TextNode list: {len(text_nodes)} nodes, {current / 1e6:.1f} MB held, "
+        f"{peak / 1e6:.1f} MB peak, {current / len(text_nodes):.0f} B/node"
+    )
+    compare(
+        len(text_nodes),
+        lambda: [TextNode(n.text, n.text_type, n.url) for n in text_nodes],
+        lambda: [DictTextNode(n.text, n.text_type, n.url) for n in text_nodes],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure the plain-text fast path of text_to_children on prose-heavy pages,
+against sending every block through the inline parser.
+
+Usage: python3 bench/bench_plain_text.py [pages] [repeat]
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import markdown_to_html  # noqa: E402
+from content_gen import generate_site  # noqa: E402
+from conversions import text_node_to_html_node  # noqa: E402
+from inline_parser import text_to_textnodes  # noqa: E402
+
+
+def parser_only(text: str, basepath: str = "/", assets=None, images=None) -> list:
+    return [
+        text_node_to_html_node(n, basepath, assets, images)
+        for n in text_to_textnodes(text)
+    ]
+
+
+def render_all(documents: list[str]) -> list[str]:
+    return [markdown_to_html.markdown_to_html_node(md).to_html() for md in documents]
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as site:
+        documents = []
+        for path in generate_site("small", site, pages):
+            with open(path) as f:
+                documents.append(f.read())
+    size = sum(len(md) for md in documents)
+    print(f"{len(documents)} prose pages ({size / 1e3:.0f} kB), best of {repeat}")
+
+    fast_path = markdown_to_html.text_to_children
+    results = {}
+    for name, children in (("parser", parser_only), ("fastpath", fast_path)):
+        markdown_to_html.text_to_children = children
+        try:
+            results[name] = render_all(documents), min(
+                timeit.repeat(lambda: render_all(documents), number=1, repeat=repeat)
+            )
+        finally:
+            markdown_to_html.text_to_children = fast_path
+        print(f"  {name:<9} {results[name][1] * 1000:8.2f} ms")
+    assert results["parser"][0] == results["fastpath"][0]
+    print(f"  speedup   {results['parser'][1] / results['fastpath'][1]:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Time precompressing a built site: one thread against the thread pool, and
+a rebuild where every sibling is already up to date.
+
+Usage: python3 bench/bench_precompress.py [pages] [kB per page]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from precompress import ENCODINGS, precompress_tree  # noqa: E402
+
+SENTENCE = "In a hole in the ground there lived a hobbit, number {}. "
+
+
+def write_site(directory, pages, size_kb):
+    for i in range(pages):
+        path = os.path.join(directory, f"section{i % 20}", f"page{i}", "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        paragraphs = []
+        length = 0
+        n = 0
+        while length < size_kb * 1024:
+            paragraph = f"<p>{SENTENCE.format(n) * 8}</p>\n"
+            paragraphs.append(paragraph)
+            length += len(paragraph)
+            n += 1
+        with open(path, "w") as f:
+            f.write("".join(paragraphs))
+
+
+def remove_siblings(directory):
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(tuple(ENCODINGS)):
+                os.remove(os.path.join(root, name))
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        write_site(docs, pages, size_kb)
+        print(f"{pages} pages of {size_kb} kB, encodings: {', '.join(ENCODINGS)}")
+
+        remove_siblings(docs)
+        serial = timed(lambda: precompress_tree(docs, workers=1))
+        remove_siblings(docs)
+        threaded = timed(lambda: precompress_tree(docs))
+        rebuild = timed(lambda: precompress_tree(docs))
+        print(f"  {'1 thread':<16} {serial * 1000:10.1f} ms")
+        print(f"  {'thread pool':<16} {threaded * 1000:10.1f} ms")
+        print(f"  {'up to date':<16} {rebuild * 1000:10.1f} ms")
+        shutil.rmtree(docs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Time a full static sync of an image-heavy tree: the old serial copy2
+loop against the threaded copier, and against --link-static.
+
+Usage: python3 bench/bench_static_sync.py [files] [kB per file]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from static_sync import sync_static_files  # noqa: E402
+
+
+def serial_copy2(src_dir, dest_dir):
+    for root, _, files in os.walk(src_dir):
+        for name in files:
+            src_path = os.path.join(root, name)
+            dst_path = os.path.join(dest_dir, os.path.relpath(src_path, src_dir))
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            shutil.copy2(src_path, dst_path)
+
+
+def timed(fn, dest_dir) -> float:
+    shutil.rmtree(dest_dir, ignore_errors=True)
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "static")
+        dest = os.path.join(tmp, "docs")
+        for i in range(files):
+            path = os.path.join(src, "images", f"set{i % 50}", f"img{i}.png")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(os.urandom(size_kb * 1024))
+        print(f"{files} files of {size_kb} kB")
+
+        runs = (
+            ("serial copy2", lambda: serial_copy2(src, dest)),
+            ("threads=1", lambda: sync_static_files(src, dest, threads=1)),
+            ("threads=8", lambda: sync_static_files(src, dest, threads=8)),
+            ("link", lambda: sync_static_files(src, dest, link=True)),
+        )
+        baseline = None
+        for name, fn in runs:
+            seconds = timed(fn, dest)
+            baseline = baseline or seconds
+            print(f"  {name:<13} {seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare peak memory of rendering one very large markdown page whole
+against streaming it block by block, using tracemalloc.
+
+Usage: python3 bench/bench_stream_memory.py [blocks]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import page_generator  # noqa: E402
+from content_gen import REPO_ROOT, make_page  # noqa: E402
+from template import Template  # noqa: E402
+
+
+def measure(source, template, dest, threshold) -> tuple[float, int]:
+    with mock.patch.object(page_generator, "STREAM_THRESHOLD", threshold):
+        tracemalloc.start()
+        start = time.perf_counter()
+        page_generator.write_page(source, template, dest)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    template = Template.load(os.path.join(REPO_ROOT, "template.html"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "index.md")
+        with open(source, "w") as f:
+            f.write(make_page(random.Random(0), "Changelog", blocks, inline=True))
+        size = os.path.getsize(source)
+        print(f"one page of {blocks} blocks ({size / 1e6:.1f} MB)")
+
+        outputs = {}
+        for name, threshold in (("whole", size + 1), ("streamed", 0)):
+            dest = os.path.join(tmp, name, "index.html")
+            elapsed, peak = measure(source, template, dest, threshold)
+            with open(dest) as f:
+                outputs[name] = f.read()
+            print(f"  {name:<9} peak {peak / 1e6:8.1f} MB  {elapsed * 1000:8.0f} ms")
+        assert outputs["whole"] == outputs["streamed"]
+
+
+if __name__ == "__main__":
+    main()
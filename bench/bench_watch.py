@@ -0,0 +1,88 @@
+"""
+Time the --watch loop on a large generated site: an idle poll, and how long
+an edited page takes to show up in the output, with inotify and with the
+polling fallback.
+
+Usage: python3 bench/bench_watch.py [pages]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from content_gen import generate_site  # noqa: E402
+from watch import SiteWatcher  # noqa: E402
+
+EDITS = 5
+
+
+def edit_latency(watcher, page, dest_page) -> float:
+    """Seconds from saving page until the watcher has rendered it."""
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, kwargs={"stop": stop})
+    thread.start()
+    times = []
+    try:
+        for i in range(EDITS):
+            time.sleep(0.1)
+            title = f"Edit {i}"
+            start = time.perf_counter()
+            with open(page, "w") as f:
+                f.write(f"# {title}\n\nEdited.\n")
+            while True:
+                try:
+                    with open(dest_page) as f:
+                        if f"<title>{title}</title>" in f.read():
+                            break
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.001)
+            times.append(time.perf_counter() - start)
+    finally:
+        stop.set()
+        thread.join()
+    return statistics.median(times)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_site("small", tmp, pages)
+        content = os.path.join(tmp, "content")
+        page = os.path.join(content, "section0", "page0", "index.md")
+        dest = os.path.join(tmp, "docs")
+        dest_page = os.path.join(dest, "section0", "page0", "index.html")
+        print(f"{pages} pages")
+
+        for name, use_inotify in (("polling", False), ("inotify", True)):
+            start = time.perf_counter()
+            watcher = SiteWatcher(
+                content,
+                os.path.join(tmp, "static"),
+                os.path.join(tmp, "template.html"),
+                dest,
+                "/",
+                use_inotify=use_inotify,
+            )
+            startup = time.perf_counter() - start
+            idle = []
+            for _ in range(EDITS):
+                start = time.perf_counter()
+                watcher.poll()
+                idle.append(time.perf_counter() - start)
+            latency = edit_latency(watcher, page, dest_page)
+            watcher.close()
+            print(
+                f"  {name:<8} startup {startup * 1000:7.0f} ms"
+                f"  idle poll {statistics.median(idle) * 1000:8.2f} ms"
+                f"  edit -> output {latency * 1000:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
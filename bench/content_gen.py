@@ -0,0 +1,132 @@
+"""
+Generate synthetic site trees (content/, static/, template.html) for
+benchmarking.
+
+Shapes:
+    small   many short pages spread over a few directories
+    huge    a handful of very long pages
+    deep    pages nested in a deep chain of directories
+    inline  prose with heavy inline markup in every block
+
+Usage: python3 bench/content_gen.py SHAPE DEST [--pages N]
+"""
+
+import argparse
+import os
+import random
+import shutil
+
+SHAPES = ("small", "huge", "deep", "inline")
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while middle earth sleeps and "
+    "rivendell keeps its long watch under the pale stars of the elder days"
+).split()
+
+
+def sentence(rng: random.Random, words: int, inline: bool) -> str:
+    parts = [rng.choice(WORDS) for _ in range(words)]
+    if inline:
+        for i in range(0, len(parts), 4):
+            kind = rng.randrange(5)
+            if kind == 0:
+                parts[i] = f"**{parts[i]}**"
+            elif kind == 1:
+                parts[i] = f"_{parts[i]}_"
+            elif kind == 2:
+                parts[i] = f"`{parts[i]}`"
+            elif kind == 3:
+                parts[i] = f"[{parts[i]}](/blog/{parts[i]})"
+            else:
+                parts[i] = f"![{parts[i]}](/images/{parts[i]}.png)"
+    return " ".join(parts).capitalize() + "."
+
+
+def make_block(rng: random.Random, inline: bool) -> str:
+    kind = rng.randrange(10)
+    if kind == 0:
+        return "#" * rng.randint(2, 4) + " " + sentence(rng, 4, False)[:-1]
+    if kind == 1:
+        items = rng.randint(2, 8)
+        return "\n".join(f"- {sentence(rng, 8, inline)}" for _ in range(items))
+    if kind == 2:
+        items = rng.randint(2, 8)
+        return "\n".join(f"{i + 1}. {sentence(rng, 8, inline)}" for i in range(items))
+    if kind == 3:
+        return "\n".join(f"> {sentence(rng, 10, inline)}" for _ in range(2))
+    if kind == 4:
+        code = "\n".join(f"print({rng.choice(WORDS)!r})" for _ in range(4))
+        return f"```\n{code}\n```"
+    return "\n".join(sentence(rng, 14, inline) for _ in range(rng.randint(1, 4)))
+
+
+def make_page(rng: random.Random, title: str, blocks: int, inline=False) -> str:
+    body = [make_block(rng, inline) for _ in range(blocks)]
+    return f"# {title}\n\n" + "\n\n".join(body) + "\n"
+
+
+def page_layout(shape: str, pages: int) -> list[tuple[str, int, bool]]:
+    """Return (relative directory, block count, inline heavy) for every page."""
+    if shape == "small":
+        return [
+            (os.path.join(f"section{i % 20}", f"page{i}"), 10, False)
+            for i in range(pages)
+        ]
+    if shape == "huge":
+        return [(f"huge{i}", 5000, False) for i in range(max(1, pages // 100))]
+    if shape == "deep":
+        layout = []
+        for i in range(pages):
+            depth = i % 25
+            parts = [f"level{d}" for d in range(depth)] + [f"page{i}"]
+            layout.append((os.path.join(*parts), 10, False))
+        return layout
+    if shape == "inline":
+        return [
+            (os.path.join(f"section{i % 20}", f"page{i}"), 20, True)
+            for i in range(pages)
+        ]
+    raise ValueError(f"Unknown shape: {shape}")
+
+
+def generate_site(shape: str, dest: str, pages: int = 200, seed: int = 0) -> list[str]:
+    """
+    Write a site of the given shape under dest and return the paths of
+    the generated markdown files.
+    """
+    rng = random.Random(seed)
+    content_dir = os.path.join(dest, "content")
+    sources = []
+    for rel_dir, blocks, inline in page_layout(shape, pages):
+        path = os.path.join(content_dir, rel_dir, "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(make_page(rng, rel_dir.replace(os.sep, " "), blocks, inline))
+        sources.append(path)
+
+    with open(os.path.join(content_dir, "index.md"), "w") as f:
+        f.write(make_page(rng, "Home", 5))
+    sources.append(os.path.join(content_dir, "index.md"))
+
+    shutil.copy(
+        os.path.join(REPO_ROOT, "template.html"), os.path.join(dest, "template.html")
+    )
+    shutil.copytree(os.path.join(REPO_ROOT, "static"), os.path.join(dest, "static"))
+    return sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("shape", choices=SHAPES)
+    parser.add_argument("dest")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sources = generate_site(args.shape, args.dest, args.pages, args.seed)
+    print(f"Wrote {len(sources)} pages to {args.dest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Time each stage of the build pipeline, and the full build, on synthetic
+content trees, and write the results as JSON.
+
+Usage:
+    python3 bench/run_benchmarks.py [--pages N] [--shapes small,huge]
+        [--output results.json] [--compare baseline.json]
+
+With --compare, every stage is checked against an earlier results file and
+the script exits with status 1 if any stage got slower than --tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+import main as ssg_main  # noqa: E402
+from block_parser import markdown_to_blocks  # noqa: E402
+from block_tokenizer import tokenize_blocks  # noqa: E402
+from block_type import BlockType, block_to_block_type  # noqa: E402
+from content_gen import SHAPES, generate_site  # noqa: E402
+from inline_parser import text_to_textnodes  # noqa: E402
+from markdown_to_html import markdown_to_html_node  # noqa: E402
+from page_generator import generate_page, write_page  # noqa: E402
+from template import Template  # noqa: E402
+
+# tokenize_blocks and write_page are what the build runs. markdown_to_blocks,
+# block_to_block_type and generate_page (which compiles the template for
+# every page) are the old entry points, kept so results stay comparable with
+# earlier runs.
+STAGES = (
+    "tokenize_blocks",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "text_to_textnodes",
+    "to_html",
+    "write_page",
+    "generate_page",
+    "main",
+)
+
+
+def best_of(repeat, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_shape(shape: str, pages: int, repeat: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as site:
+        sources = generate_site(shape, site, pages)
+        documents = []
+        for path in sources:
+            with open(path) as f:
+                documents.append(f.read())
+
+        blocks = [block for md in documents for block in markdown_to_blocks(md)]
+        paragraphs = [
+            block.replace("\n", " ")
+            for block in blocks
+            if block_to_block_type(block) == BlockType.PARAGRAPH
+        ]
+        trees = [markdown_to_html_node(md) for md in documents]
+        template = os.path.join(site, "template.html")
+        compiled = Template.load(template, "/")
+        out_dir = os.path.join(site, "bench_out")
+
+        def run_write_page():
+            for i, path in enumerate(sources):
+                dest = os.path.join(out_dir, str(i), "index.html")
+                write_page(path, compiled, dest)
+
+        def run_generate_page():
+            for i, path in enumerate(sources):
+                dest = os.path.join(out_dir, str(i), "index.html")
+                generate_page(path, template, dest, "/")
+
+        def run_main():
+            ssg_main.main(["--clean", "--no-render-cache", "--quiet"])
+
+        timings = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings["tokenize_blocks"] = best_of(
+                repeat, lambda: [list(tokenize_blocks(md)) for md in documents]
+            )
+            timings["markdown_to_blocks"] = best_of(
+                repeat, lambda: [markdown_to_blocks(md) for md in documents]
+            )
+            timings["block_to_block_type"] = best_of(
+                repeat, lambda: [block_to_block_type(block) for block in blocks]
+            )
+            timings["text_to_textnodes"] = best_of(
+                repeat, lambda: [text_to_textnodes(text) for text in paragraphs]
+            )
+            timings["to_html"] = best_of(
+                repeat, lambda: [tree.to_html() for tree in trees]
+            )
+            timings["write_page"] = best_of(repeat, run_write_page)
+            timings["generate_page"] = best_of(repeat, run_generate_page)
+
+            cwd = os.getcwd()
+            os.chdir(site)
+            try:
+                timings["main"] = best_of(repeat, run_main)
+            finally:
+                os.chdir(cwd)
+    return timings
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BENCH_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return a description of every stage that regressed past tolerance."""
+    regressions = []
+    for shape, timings in results["results"].items():
+        old_timings = baseline.get("results", {}).get(shape, {})
+        for stage, seconds in timings.items():
+            old = old_timings.get(stage)
+            if not old:
+                continue
+            ratio = seconds / old
+            print(f"  {shape:<7} {stage:<20} {ratio:6.2f}x of baseline")
+            if ratio > 1 + tolerance:
+                regressions.append(f"{shape}/{stage}: {old:.4f}s -> {seconds:.4f}s")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the build pipeline.")
+    parser.add_argument("--pages", type=int, default=200, help="pages per shape")
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help=f"comma-separated shapes to run (default: {','.join(SHAPES)})",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="keep the best of N runs"
+    )
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against an earlier results file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed slowdown against --compare before failing (default 0.10)",
+    )
+    args = parser.parse_args(argv)
+    args.shapes = [shape for shape in args.shapes.split(",") if shape]
+    for shape in args.shapes:
+        if shape not in SHAPES:
+            parser.error(f"unknown shape: {shape}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "pages": args.pages,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    for shape in args.shapes:
+        timings = bench_shape(shape, args.pages, args.repeat)
+        results["results"][shape] = timings
+        print(f"{shape}:")
+        for stage in STAGES:
+            print(f"  {stage:<20} {timings[stage] * 1000:10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        if baseline.get("meta", {}).get("pages") != args.pages:
+            print("  note: baseline was run with a different --pages")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
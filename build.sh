@@ -1,4 +1,4 @@
 #!/bin/bash
 
 # Build the site for production with the GitHub repo name as basepath
-python3 src/main.py "/ssg/"
+python3 src/main.py "/ssg/" --quiet
@@ -0,0 +1,74 @@
+from typing import Iterable, Iterator, NamedTuple
+from block_type import BlockType, lines_to_block_type
+
+FENCE = "```"
+
+
+class Block(NamedTuple):
+    """
+    A typed markdown block with its lines already separated.
+
+    Lines are stripped of surrounding whitespace. For CODE blocks the
+    opening and closing fence lines are not included, so `lines` holds
+    only the code itself.
+    """
+
+    block_type: BlockType
+    lines: list[str]
+
+
+def tokenize_blocks(markdown: str) -> Iterator[Block]:
+    """
+    Scan a markdown document once and yield its blocks in order.
+
+    Blocks are separated by blank lines, except inside a fenced code block,
+    which runs until the first line ending with ``` (or the end of the
+    document) and keeps its blank lines.
+    """
+    return tokenize_lines(split_lines(markdown))
+
+
+def split_lines(markdown: str) -> list[str]:
+    """
+    Split markdown at \n, \r\n and \r only, the line ends of a file read
+    a line at a time, so that a document gives the same lines as a string
+    as it does streamed from disk. (str.splitlines would also break at form
+    feeds, U+2028 and the like.)
+    """
+    if "\r" in markdown:
+        markdown = markdown.replace("\r\n", "\n").replace("\r", "\n")
+    return markdown.split("\n")
+
+
+def tokenize_lines(lines: Iterable[str]) -> Iterator[Block]:
+    current = []
+    in_fence = False
+
+    for raw_line in lines:
+        line = raw_line.strip()
+
+        if in_fence:
+            if line.endswith(FENCE):
+                yield Block(BlockType.CODE, current)
+                current = []
+                in_fence = False
+            else:
+                current.append(line)
+
+        elif line:
+            if current or not line.startswith(FENCE):
+                current.append(line)
+            elif len(line) >= 2 * len(FENCE) and line.endswith(FENCE):
+                # Opened and closed on the same line: there is no code body
+                yield Block(BlockType.CODE, [])
+            else:
+                in_fence = True
+
+        elif current:
+            yield Block(lines_to_block_type(current), current)
+            current = []
+
+    if in_fence:
+        yield Block(BlockType.CODE, current)
+    elif current:
+        yield Block(lines_to_block_type(current), current)
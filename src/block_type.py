@@ -1,6 +1,8 @@
 from enum import Enum
 import re
 
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+
 
 class BlockType(Enum):
     PARAGRAPH = "paragraph"
@@ -12,27 +14,50 @@ class BlockType(Enum):
 
 
 def block_to_block_type(block: str) -> BlockType:
-    if re.match(r"^#{1,6} ", block):
+    return lines_to_block_type(block.splitlines())
+
+
+def lines_to_block_type(lines: list[str]) -> BlockType:
+    """Classify a block that has already been split into lines."""
+    if not lines or not lines[0]:
+        return BlockType.PARAGRAPH
+
+    # Every non-paragraph type is recognisable by its first character, so
+    # plain text (the common case) never reaches the more expensive checks.
+    first = lines[0][0]
+    if first == "#" and HEADING_PATTERN.match(lines[0]):
         return BlockType.HEADING
-    elif re.match(r"^```[\s\S]*```$", block):
+    elif first == "`" and is_code(lines):
         return BlockType.CODE
+    elif first == ">" and all(line.startswith(">") for line in lines):
+        return BlockType.QUOTE
+    elif first == "-" and all(line.startswith("- ") for line in lines):
+        return BlockType.UNORDERED_LIST
+    elif first == "1" and is_ordered_list(lines):
+        return BlockType.ORDERED_LIST
     else:
-        lines = block.splitlines()
-        if lines and all(line.startswith(">") for line in lines):
-            return BlockType.QUOTE
-        elif lines and all(re.match(r"^- ", line) for line in lines):
-            return BlockType.UNORDERED_LIST
-        elif is_ordered_list_block(block):
-            return BlockType.ORDERED_LIST
-        else:
-            return BlockType.PARAGRAPH
+        return BlockType.PARAGRAPH
+
+
+def is_code(lines: list[str]) -> bool:
+    # Same as matching ^```[\s\S]*```$ against the joined block: opening and
+    # closing fences must not overlap on a single line.
+    first, last = lines[0], lines[-1]
+    if not (first.startswith("```") and last.endswith("```")):
+        return False
+    return len(lines) > 1 or len(first) >= 6
 
 
 def is_ordered_list_block(block: str) -> bool:
-    lines = block.strip().splitlines()
+    return is_ordered_list(block.strip().splitlines())
+
+
+def is_ordered_list(lines: list[str]) -> bool:
     if not lines:  # no lines means no ordered list
         return False
-    for i, line in enumerate(lines):
-        if not re.match(rf"^{i+1}\. ", line):
+    # Each line must start with its own number, counting up from 1
+    for i, line in enumerate(lines, 1):
+        number, dot, _ = line.partition(". ")
+        if not dot or number != str(i):
             return False
     return True
@@ -0,0 +1,95 @@
+import json
+import logging
+import sys
+
+# Every module logs through this one logger so a single call configures
+# the whole build.
+logger = logging.getLogger("ssg")
+
+LEVELS = {
+    "quiet": logging.WARNING,  # warnings and errors only
+    "normal": logging.INFO,  # notable events and the build summary
+    "verbose": logging.DEBUG,  # a line for every page and file
+}
+
+_settings = None
+
+
+def event(name: str, **data) -> dict:
+    """
+    Build the `extra` argument for a log call that is also an event in the
+    JSON-lines stream, e.g. logger.debug(msg, extra=event("page", source=p)).
+    """
+    return {"event": name, "data": data}
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname.lower(),
+            "event": getattr(record, "event", "message"),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "data", {}))
+        return json.dumps(entry)
+
+
+def configure_logging(
+    verbosity: str = "normal", events_path: str | None = None, append: bool = False
+) -> None:
+    """
+    Send build output to stdout at the given verbosity and, optionally, every
+    event (whatever the verbosity) to events_path as JSON lines. The events
+    file is started afresh unless append is set.
+
+    The events file is always written in append mode, so that records from
+    this process and from worker processes (see init_worker_logging) land
+    at the end of the file instead of over each other.
+    """
+    global _settings
+    _settings = (verbosity, events_path)
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.propagate = False
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(LEVELS[verbosity])
+    console.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(console)
+    level = LEVELS[verbosity]
+
+    if events_path is not None:
+        if not append:
+            open(events_path, "w").close()
+        events = logging.FileHandler(events_path, mode="a")
+        events.setLevel(logging.DEBUG)
+        events.setFormatter(JSONLinesFormatter())
+        logger.addHandler(events)
+        level = logging.DEBUG
+
+    logger.setLevel(level)
+
+
+def logging_settings():
+    """The arguments of the last configure_logging call, or None."""
+    return _settings
+
+
+def init_worker_logging(settings) -> None:
+    """ProcessPoolExecutor initializer that mirrors the parent's logging."""
+    if settings is not None:
+        verbosity, events_path = settings
+        configure_logging(verbosity, events_path, append=True)
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "kB", "MB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} GB"
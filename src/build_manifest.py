@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+
+# Bump this whenever the layout of a manifest changes so that old files
+# are ignored instead of misread.
+MANIFEST_VERSION = 4
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    # Read in chunks so that hashing a very large source stays cheap on memory
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path: str) -> dict:
+    """
+    Load a build manifest from disk.
+
+    A missing, unreadable or outdated manifest is treated as empty,
+    which simply makes the next build a full one.
+    """
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    manifest = dict(manifest, version=MANIFEST_VERSION)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -2,7 +2,49 @@ from htmlnode import LeafNode
 from textnode import TextNode, TextType
 
 
-def text_node_to_html_node(text_node: TextNode) -> LeafNode:
+def with_basepath(url: str, basepath: str, assets: dict | None = None) -> str:
+    """
+    Prefix a root-relative URL (one starting with "/") with basepath. With
+    assets, a map of root-relative URLs to fingerprinted ones, an asset's
+    URL is first swapped for its fingerprinted one.
+    """
+    if assets:
+        url = assets.get(url, url)
+    if basepath != "/" and url.startswith("/"):
+        return basepath + url[1:]
+    return url
+
+
+def image_props(info: dict, src: str, basepath: str = "/") -> dict:
+    """
+    The extra <img> attributes for an image described in ImageResult.images
+    and served from src: its intrinsic size, its resized variants (if any)
+    and src itself at full width as a srcset, and lazy loading.
+    """
+    props = {}
+    if info["variants"]:
+        width = info["width"]
+        candidates = [
+            f"{with_basepath(url, basepath)} {variant_width}w"
+            for url, variant_width in info["variants"]
+        ]
+        # With w descriptors src is not a candidate by itself, so list it
+        # too or wide and high-density screens get an upscaled variant
+        candidates.append(f"{src} {width}w")
+        props["srcset"] = ", ".join(candidates)
+        props["sizes"] = f"(max-width: {width}px) 100vw, {width}px"
+    props["width"] = str(info["width"])
+    props["height"] = str(info["height"])
+    props["loading"] = "lazy"
+    return props
+
+
+def text_node_to_html_node(
+    text_node: TextNode,
+    basepath: str = "/",
+    assets: dict | None = None,
+    images: dict | None = None,
+) -> LeafNode:
     if text_node.text_type == TextType.TEXT:
         return LeafNode(None, text_node.text)
     elif text_node.text_type == TextType.BOLD:
@@ -12,16 +54,17 @@ def text_node_to_html_node(text_node: TextNode) -> LeafNode:
     elif text_node.text_type == TextType.CODE:
         return LeafNode("code", text_node.text)
     elif text_node.text_type == TextType.LINK:
-        return LeafNode("a", text_node.text, {"href": text_node.url})
+        href = with_basepath(text_node.url, basepath, assets)
+        return LeafNode("a", text_node.text, {"href": href})
     elif text_node.text_type == TextType.IMAGE:
         if not text_node.url:
             raise ValueError("TextType.IMAGE requires a non-empty URL")
-        return LeafNode(
-            "img",
-            text_node.text,
-            {
-                "src": text_node.url,
-                "alt": text_node.text,
-            },
-        )
+        props = {
+            "src": with_basepath(text_node.url, basepath, assets),
+            "alt": text_node.text,
+        }
+        info = images.get(text_node.url) if images else None
+        if info is not None:
+            props.update(image_props(info, props["src"], basepath))
+        return LeafNode("img", text_node.text, props)
     raise ValueError(f"Unsupported TextType: {text_node.text_type}")
@@ -0,0 +1,157 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+
+# Event bits from <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# Completed writes, touches, and entries that appear or go away
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def _load_libc():
+    if not hasattr(os, "O_NONBLOCK"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError, TypeError):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+class TreeEvents:
+    """
+    Recursive inotify watches on directory trees. read() returns the paths
+    that changed since the last call without walking the trees, so that
+    waiting for an edit costs nothing however large the site is.
+
+    Directories created inside a watched tree are watched as they appear.
+    When the kernel drops events (its queue overflowed), read() returns None
+    and the caller has to look at the whole trees again.
+    """
+
+    def __init__(self, roots) -> None:
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise _os_error()
+        self.directories = {}  # watch descriptor -> directory path
+        self.watches = {}  # directory path -> watch descriptor
+        try:
+            for root in roots:
+                self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def _watch_tree(self, root) -> None:
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            wd = _libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR
+            )
+            if wd < 0:
+                error = _os_error(directory)
+                if error.errno in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # gone again already; its parent reports that
+                raise error
+            self.directories[wd] = directory
+            self.watches[directory] = wd
+            try:
+                with os.scandir(directory) as entries:
+                    stack.extend(e.path for e in entries if e.is_dir())
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    def _unwatch_tree(self, root) -> None:
+        prefix = root + os.sep
+        for directory in [
+            d for d in self.watches if d == root or d.startswith(prefix)
+        ]:
+            wd = self.watches.pop(directory)
+            self.directories.pop(wd, None)
+            _libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> set[str] | None:
+        """
+        Return the paths of the files and directories that were written,
+        touched, created, moved or deleted since the last call, or None if
+        some events were lost.
+        """
+        changed = set()
+        overflowed = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, pos)
+                pos += EVENT_HEADER.size
+                name = os.fsdecode(data[pos : pos + length].rstrip(b"\0"))
+                pos += length
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                if mask & IN_IGNORED:
+                    directory = self.directories.pop(wd, None)
+                    if self.watches.get(directory) == wd:
+                        del self.watches[directory]
+                    continue
+                directory = self.directories.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                changed.add(path)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(path)
+                    elif mask & IN_MOVED_FROM:
+                        # Its watches would keep reporting under the old name
+                        self._unwatch_tree(path)
+        return None if overflowed else changed
+
+
+def tree_events(roots) -> TreeEvents | None:
+    """
+    Return a TreeEvents for roots, or None where inotify is not available
+    (not Linux, or out of watches), in which case the caller polls.
+    """
+    if _libc is None:
+        return None
+    try:
+        return TreeEvents(roots)
+    except OSError:
+        return None
+
+
+def _os_error(path=None) -> OSError:
+    code = ctypes.get_errno()
+    return OSError(code, os.strerror(code), path)
@@ -0,0 +1,17 @@
+import os
+
+
+def remove_empty_parents(path: str, root: str) -> None:
+    """
+    Remove the directory containing path, and then its parents, for as
+    long as they are empty. Nothing at or above root is ever removed.
+    """
+    root = os.path.abspath(root)
+    directory = os.path.dirname(os.path.abspath(path))
+    while (
+        directory.startswith(root + os.sep)
+        and os.path.isdir(directory)
+        and not os.listdir(directory)
+    ):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
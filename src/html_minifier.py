@@ -0,0 +1,107 @@
+import re
+
+# Tags, comments and the text between them. Quoted attribute values may
+# contain ">", and a "<" that does not start a tag is text.
+TOKEN_PATTERN = re.compile(
+    r"<!--.*?-->|<[!/a-zA-Z](?:[^>\"']|\"[^\"]*\"|'[^']*')*>|[^<]+|<", re.DOTALL
+)
+TAG_NAME_PATTERN = re.compile(r"</?([a-zA-Z][a-zA-Z0-9-]*)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Elements whose text is kept exactly as written
+RAW_ELEMENTS = frozenset(["pre", "textarea", "script", "style"])
+
+# Whitespace next to these tags is never rendered, so it can be dropped
+# entirely; elsewhere a run of whitespace still renders as one space.
+BLOCK_ELEMENTS = frozenset(
+    [
+        "html", "head", "body", "title", "meta", "link", "base", "script",
+        "style", "noscript", "header", "footer", "main", "nav", "section",
+        "article", "aside", "div", "p", "h1", "h2", "h3", "h4", "h5", "h6",
+        "ul", "ol", "li", "dl", "dt", "dd", "blockquote", "pre", "figure",
+        "figcaption", "hr", "br", "table", "thead", "tbody", "tfoot", "tr",
+        "th", "td", "form", "fieldset", "address", "details", "summary",
+    ]
+)  # fmt: skip
+
+
+def _tag_name(token: str) -> str | None:
+    match = TAG_NAME_PATTERN.match(token)
+    return match.group(1).lower() if match else None
+
+
+def _is_block(token: str | None) -> bool:
+    # The document edges, <!doctype> and comments count as block boundaries;
+    # text never does
+    if token is None or token.startswith("<!"):
+        return True
+    return _tag_name(token) in BLOCK_ELEMENTS
+
+
+def minify_html(html: str) -> str:
+    """
+    Remove the whitespace and comments in html that do not change how it
+    renders: whitespace runs collapse to one space, and disappear next to
+    block-level tags. The contents of <pre>, <textarea>, <script> and
+    <style> are kept as they are, as are conditional comments.
+
+    Meant for templates, which are minified once when they are compiled;
+    the page content inserted into them is not touched.
+    """
+    tokens = _tokenize(html)
+    out = []
+    for i, (token, raw) in enumerate(tokens):
+        if raw or _is_tag(token):
+            out.append(token)
+            continue
+        if token.startswith("<!--"):
+            if token.startswith("<!--[if"):
+                out.append(token)
+            continue
+
+        text = WHITESPACE_PATTERN.sub(" ", token)
+        previous = out[-1] if out else None
+        following = _next_token(tokens, i)
+        if text.startswith(" ") and (
+            _is_block(previous) or previous.endswith(" ")
+        ):
+            text = text[1:]
+        if text.endswith(" ") and _is_block(following):
+            text = text[:-1]
+        if text:
+            out.append(text)
+    return "".join(out)
+
+
+def _tokenize(html: str) -> list[tuple[str, bool]]:
+    """
+    Split html into (token, raw) pairs. The whole content of a raw element
+    is one token with raw set, so nothing inside it is taken for a tag.
+    """
+    tokens = []
+    pos = 0
+    while pos < len(html):
+        token = TOKEN_PATTERN.match(html, pos).group()
+        pos += len(token)
+        tokens.append((token, False))
+        name = _tag_name(token)
+        if name in RAW_ELEMENTS and token[1] != "/" and not token.endswith("/>"):
+            close = re.compile(rf"</{name}\s*>", re.IGNORECASE).search(html, pos)
+            end = close.start() if close else len(html)
+            if end > pos:
+                tokens.append((html[pos:end], True))
+            pos = end
+    return tokens
+
+
+def _is_tag(token: str) -> bool:
+    return token.startswith("<") and not token.startswith("<!--") and len(token) > 1
+
+
+def _next_token(tokens, i):
+    # The token after tokens[i] that will be kept, or None at the end
+    for token, _ in tokens[i + 1 :]:
+        if token.startswith("<!--") and not token.startswith("<!--[if"):
+            continue
+        return token
+    return None
@@ -1,3 +1,11 @@
+from types import MappingProxyType
+
+# Shared, immutable stand-ins for "no children" and "no attributes". Leaf and
+# parent nodes use these instead of allocating an empty list and dict each.
+NO_CHILDREN = ()
+NO_PROPS = MappingProxyType({})
+
+
 class HTMLNode:
     """
     Represents a node in an HTML document tree.
@@ -15,7 +23,12 @@ class HTMLNode:
         props (dict[str, str] | None): HTML attributes for the tag (e.g. {"href": "https://example.com"}).
 
     Methods:
-        to_html(): Must be implemented by subclasses to convert the node to HTML.
+        to_html(): Returns the node's HTML as a single string.
+        render_into(write): Must be implemented by subclasses. Passes the node's HTML to
+            `write` fragment by fragment (e.g. list.append, StringIO.write or file.write),
+            so a whole tree is rendered into one buffer instead of one string per level.
+        iter_html(): Must be implemented by subclasses. Yields the same fragments lazily.
+        text_content(): Must be implemented by subclasses. Returns the text without tags.
         props_to_html(): Converts the props dictionary to a string of HTML attributes.
         __repr__(): Returns a developer-friendly representation of the node for debugging.
 
@@ -31,8 +44,12 @@ class HTMLNode:
         - If value is None: The node is assumed to contain child nodes (children will be rendered).
         - If children is None or empty: The node is assumed to render its value.
         - If props is None or empty: The HTML tag will have no attributes.
+
+    Nodes use __slots__ to keep documents with many thousands of nodes small.
     """
 
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
         self,
         tag: str | None = None,
@@ -46,11 +63,28 @@ class HTMLNode:
         self.props = props if props is not None else {}
 
     def to_html(self):
+        parts = []
+        self.render_into(parts.append)
+        return "".join(parts)
+
+    def render_into(self, write) -> None:
         raise NotImplementedError(
             "Child classes will override this method to render themselves as HTML."
         )
 
+    def iter_html(self):
+        raise NotImplementedError(
+            "Child classes will override this method to render themselves as HTML."
+        )
+
+    def text_content(self) -> str:
+        raise NotImplementedError(
+            "Child classes will override this method to return their text."
+        )
+
     def props_to_html(self):
+        if not self.props:
+            return ""
         return "".join(f' {key}="{value}"' for key, value in self.props.items())
 
     def __repr__(self) -> str:
@@ -58,7 +92,7 @@ class HTMLNode:
             f"HTMLNode(tag={self.tag!r}, "
             f"value={self.value!r}, "
             f"children={self.children!r}, "
-            f"props={self.props!r})"
+            f"props={dict(self.props)!r})"
         )
 
 
@@ -89,6 +123,8 @@ class LeafNode(HTMLNode):
     - LeafNode does not accept or support child nodes.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str | None,
@@ -97,18 +133,30 @@ class LeafNode(HTMLNode):
     ) -> None:
         if not value:
             raise ValueError("All leaf nodes must have a non-empty value.")
-        super().__init__(tag=tag, value=value, children=None, props=props)
+        self.tag = tag
+        self.value = value
+        self.children = NO_CHILDREN
+        self.props = props if props else NO_PROPS
 
     def to_html(self):
         if self.tag is None:
             return self.value
         return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
 
+    def render_into(self, write) -> None:
+        write(self.to_html())
+
+    def iter_html(self):
+        yield self.to_html()
+
+    def text_content(self) -> str:
+        return self.value
+
     def __repr__(self) -> str:
         return (
             f"HTMLNode(tag={self.tag!r}, "
             f"value={self.value!r}, "
-            f"props={self.props!r})"
+            f"props={dict(self.props)!r})"
         )
 
 class ParentNode(HTMLNode):
@@ -129,11 +177,20 @@ class ParentNode(HTMLNode):
 
         node.to_html()  # Returns: "<p><b>Bold text</b>normal text<i>italic text</i></p>"
 
+    Rendering walks the tree once and writes every tag and leaf into a single
+    buffer, so no child's HTML is copied again by its ancestors:
+
+        parts = []
+        node.render_into(parts.append)  # or f.write to stream to a file
+
     Attributes:
         tag (str): The HTML tag name (e.g., "div", "ul").
         children (list): A list of HTMLNode instances to render within the parent tag.
         props (dict, optional): HTML attributes like class, id, etc.
     """
+
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str,
@@ -142,9 +199,23 @@ class ParentNode(HTMLNode):
     ) -> None:
         if not tag:
             raise ValueError("ParentNode requires a tag.")
-        super().__init__(tag=tag, value=None, children=children, props=props)
-
-    def to_html(self):
-        children_html = "".join(child.to_html() for child in self.children)
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+        self.tag = tag
+        self.value = None
+        self.children = children if children is not None else NO_CHILDREN
+        self.props = props if props else NO_PROPS
+
+    def render_into(self, write) -> None:
+        write(f"<{self.tag}{self.props_to_html()}>")
+        for child in self.children:
+            child.render_into(write)
+        write(f"</{self.tag}>")
+
+    def iter_html(self):
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for child in self.children:
+            yield from child.iter_html()
+        yield f"</{self.tag}>"
+
+    def text_content(self) -> str:
+        return "".join(child.text_content() for child in self.children)
 
@@ -0,0 +1,272 @@
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+from build_log import event, init_worker_logging, logger, logging_settings
+from build_manifest import hash_bytes, hash_file, load_manifest, save_manifest
+from fs_utils import remove_empty_parents
+from output_writer import temp_path
+from static_sync import copy_file
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional; without it images only get their size
+    Image = ImageOps = None
+
+# Images that get resized variants
+IMAGE_EXTENSIONS = frozenset([".png", ".jpg", ".jpeg", ".webp"])
+# Images that only get their size; resizing a GIF would drop its animation
+SIZED_EXTENSIONS = IMAGE_EXTENSIONS | {".gif"}
+DEFAULT_WIDTHS = (480, 960, 1440)
+VARIANT_QUALITY = 80
+# Part of every variant's name and cache key. Bump it whenever
+# encode_variants changes what it writes, so that variants made by the old
+# code are neither reused nor left in browser caches under the same name.
+ENCODER_VERSION = 2
+# EXIF orientations that turn the image a quarter, so width and height swap
+TRANSPOSED_ORIENTATIONS = frozenset([5, 6, 7, 8])
+
+
+class ImageResult(NamedTuple):
+    """What build_image_variants did, for the build summary."""
+
+    generated: int = 0
+    cached: int = 0
+    removed: int = 0
+    # Root-relative URL -> {"width", "height", "variants": [[url, width]]}
+    images: dict | None = None
+
+
+def build_image_variants(
+    src_dir,
+    dest_dir,
+    cache_dir,
+    manifest_path=None,
+    widths=DEFAULT_WIDTHS,
+    workers=None,
+    link=False,
+):
+    """
+    Write resized WebP variants of every image under src_dir into dest_dir,
+    next to the copy made by the static sync, and describe them for the
+    pages that show the images.
+
+    A variant is made for each of widths that is narrower than the image,
+    as name.<hash>.<width>w.webp, where hash comes from the source content.
+    Sizes are as the image is displayed, so a photo with an EXIF rotation
+    is described and resized upright. GIFs are described but not resized.
+    Variants are encoded in a pool of worker processes and kept in
+    cache_dir under the source hash and width, so the same image at the
+    same width is never encoded twice, even after it was removed from
+    dest_dir. Without Pillow no variants are made, but the image sizes
+    are still read from the file headers.
+
+    When manifest_path is given it keeps each source's hash and size with
+    its mtime, so unchanged images are not read again, and remembers the
+    variants it wrote, so that those no longer wanted are removed.
+
+    Returns an ImageResult.
+    """
+    previous = load_manifest(manifest_path) if manifest_path is not None else {}
+    known = previous.get("sources", {})
+    if Image is None:
+        logger.warning(
+            "Pillow is not installed; images get their size but no resized variants"
+        )
+        widths = ()
+
+    sources = {}
+    for root, _, files in os.walk(src_dir):
+        for name in files:
+            if os.path.splitext(name)[1].lower() not in SIZED_EXTENSIONS:
+                continue
+            path = os.path.join(root, name)
+            rel_path = os.path.relpath(path, src_dir)
+            stat = os.stat(path)
+            entry = known.get(rel_path)
+            if entry is None or entry[:2] != [stat.st_mtime_ns, stat.st_size]:
+                size = image_size(path)
+                if size is None:
+                    continue
+                entry = [stat.st_mtime_ns, stat.st_size, hash_file(path), *size]
+            sources[rel_path] = entry
+
+    images = {}
+    outputs = {}  # dest rel path -> cache path
+    pending = {}  # source path -> [(width, cache path)]
+    cached = 0
+    for rel_path, (_, _, digest, width, height) in sources.items():
+        key = hash_bytes(f"{ENCODER_VERSION}:{digest}".encode())
+        variants = []
+        if os.path.splitext(rel_path)[1].lower() in IMAGE_EXTENSIONS:
+            variant_widths = sorted(w for w in set(widths) if w < width)
+        else:
+            variant_widths = []
+        for variant_width in variant_widths:
+            variant = variant_name(rel_path, key, variant_width)
+            cache_path = os.path.join(cache_dir, key[:2], f"{key}-{variant_width}.webp")
+            outputs[variant] = cache_path
+            variants.append([_url(variant), variant_width])
+            if os.path.exists(cache_path):
+                cached += 1
+            else:
+                src_path = os.path.join(src_dir, rel_path)
+                pending.setdefault(src_path, []).append((variant_width, cache_path))
+        images[_url(rel_path)] = {
+            "width": width,
+            "height": height,
+            "variants": variants,
+        }
+
+    generated = sum(len(jobs) for jobs in pending.values())
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker_logging,
+            initargs=(logging_settings(),),
+        ) as pool:
+            for _ in pool.map(encode_variants, pending, pending.values()):
+                pass
+
+    for variant, cache_path in outputs.items():
+        dest_path = os.path.join(dest_dir, variant)
+        # The name changes with the content, so an existing file is current
+        if not os.path.exists(dest_path):
+            copy_file(cache_path, dest_path, link)
+
+    removed = 0
+    if manifest_path is not None:
+        for rel_path in previous.get("files", []):
+            if rel_path in outputs:
+                continue
+            dest_path = os.path.join(dest_dir, rel_path)
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+                removed += 1
+                logger.info(
+                    f"Removed: {dest_path}",
+                    extra=event("file_removed", dest=dest_path),
+                )
+            remove_empty_parents(dest_path, dest_dir)
+        save_manifest(manifest_path, {"files": sorted(outputs), "sources": sources})
+    return ImageResult(generated, cached, removed, images)
+
+
+def encode_variants(src_path, jobs) -> None:
+    """Write src_path resized to each (width, path) in jobs, as WebP."""
+    with Image.open(src_path) as image:
+        image.load()
+        # Apply the EXIF rotation; the variants carry no EXIF to do it later
+        image = ImageOps.exif_transpose(image)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        for width, path in jobs:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = temp_path(path)
+            resized.save(tmp_path, "WEBP", quality=VARIANT_QUALITY)
+            os.replace(tmp_path, path)
+            logger.debug(
+                "Resized: %s -> %s (%d px wide)",
+                src_path,
+                path,
+                width,
+                extra=event("image_resized", source=src_path, dest=path, width=width),
+            )
+
+
+def variant_name(rel_path, digest, width) -> str:
+    root, _ = os.path.splitext(rel_path)
+    return f"{root}.{digest[:10]}.{width}w.webp"
+
+
+def image_size(path) -> tuple[int, int] | None:
+    """
+    Return the (width, height) of a PNG, GIF, JPEG or WebP image from its
+    header, or None if it is none of those or its header is cut short.
+    For a JPEG these are swapped when its EXIF orientation turns it a
+    quarter, to match how it is displayed.
+    """
+    try:
+        return _header_size(path)
+    except struct.error:
+        return None
+
+
+def _header_size(path):
+    with open(path, "rb") as f:
+        header = f.read(30)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            return struct.unpack(">II", header[16:24])
+        if header[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", header[6:10])
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            return _webp_size(header)
+        if header[:2] == b"\xff\xd8":
+            f.seek(2)
+            return _jpeg_size(f)
+    return None
+
+
+def _webp_size(header):
+    chunk = header[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(header[24:27], "little") + 1
+        height = int.from_bytes(header[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _jpeg_size(f):
+    # Walk the marker segments up to the start-of-frame, which holds the
+    # size, noting the orientation in an EXIF segment on the way
+    orientation = 1
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            f.seek(-1, os.SEEK_CUR)  # fill byte
+            continue
+        if code in (0x01, 0xD8) or 0xD0 <= code <= 0xD7:
+            continue  # markers without a length
+        length = struct.unpack(">H", f.read(2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">xHH", f.read(5))
+            if orientation in TRANSPOSED_ORIENTATIONS:
+                return height, width
+            return width, height
+        if code == 0xE1:
+            orientation = _exif_orientation(f.read(length - 2)) or orientation
+            continue
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def _exif_orientation(segment) -> int | None:
+    # An APP1 segment is "Exif\0\0", then a TIFF header pointing at the
+    # first IFD, a list of 12-byte (tag, type, count, value) entries
+    if not segment.startswith(b"Exif\0\0"):
+        return None
+    tiff = segment[6:]
+    order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if order is None:
+        return None
+    offset = struct.unpack_from(order + "I", tiff, 4)[0]
+    count = struct.unpack_from(order + "H", tiff, offset)[0]
+    for i in range(count):
+        tag, _, _, value = struct.unpack_from(order + "HHIH", tiff, offset + 2 + 12 * i)
+        if tag == 0x0112:
+            return value
+    return None
+
+
+def _url(rel_path) -> str:
+    return "/" + rel_path.replace(os.sep, "/")
@@ -1,26 +1,75 @@
+import re
 from textnode import TextNode, TextType
-from markdown_extractor import extract_markdown_images, extract_markdown_links
+from markdown_extractor import (
+    IMAGE_PATTERN,
+    extract_markdown_images,
+    extract_markdown_links,
+)
+
+
+# Characters that can start inline markup; everything else is plain text.
+INLINE_MARKUP = re.compile(r"[`*_!\[]")
+# Only ever matched where a "[" was found, so no lookbehind for "!" needed
+LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
 
 
 def text_to_textnodes(text: str) -> list[TextNode]:
     """
     Convert a raw markdown string into a list of TextNode objects.
-    Applies all the splitting functions to parse markdown inline syntax.
+
+    The text is scanned once from left to right. Images and links are
+    matched where they start, and each delimiter (`, **, *, _) runs to its
+    next occurrence. Code spans are taken verbatim, so emphasis markers
+    inside them are not parsed. An unclosed delimiter raises an Exception,
+    as the split_nodes_* helpers do.
     """
-    nodes = [TextNode(text, TextType.TEXT)]
-
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-
-    return [
-        node
-        for node in nodes
-        if not (node.text == "" and node.text_type == TextType.TEXT)
-    ]
+    nodes = []
+    plain_start = 0
+    pos = 0
+
+    while True:
+        match = INLINE_MARKUP.search(text, pos)
+        if match is None:
+            break
+        start = match.start()
+        char = text[start]
+
+        if char == "!" or char == "[":
+            if char == "!":
+                found, text_type = IMAGE_PATTERN.match(text, start), TextType.IMAGE
+            elif start > 0 and text[start - 1] == "!":
+                # "![" that did not match as an image is not a link either
+                found, text_type = None, TextType.LINK
+            else:
+                found, text_type = LINK_PATTERN.match(text, start), TextType.LINK
+            if found is None:
+                pos = start + 1
+                continue
+            if plain_start < start:
+                nodes.append(TextNode(text[plain_start:start], TextType.TEXT))
+            nodes.append(TextNode(found.group(1), text_type, found.group(2)))
+            pos = plain_start = found.end()
+            continue
+
+        if char == "*" and text.startswith("**", start):
+            delimiter, text_type = "**", TextType.BOLD
+        elif char == "`":
+            delimiter, text_type = "`", TextType.CODE
+        else:
+            delimiter, text_type = char, TextType.ITALIC
+
+        inner_start = start + len(delimiter)
+        end = text.find(delimiter, inner_start)
+        if end == -1:
+            raise Exception("delimiter count is odd")
+        if plain_start < start:
+            nodes.append(TextNode(text[plain_start:start], TextType.TEXT))
+        nodes.append(TextNode(text[inner_start:end], text_type))
+        pos = plain_start = end + len(delimiter)
+
+    if plain_start < len(text):
+        nodes.append(TextNode(text[plain_start:], TextType.TEXT))
+    return nodes
 
 
 def split_nodes_delimiter(
@@ -1,39 +1,390 @@
+import argparse
+import cProfile
 import os
 import shutil
-import sys
+import threading
+import time
+from build_log import configure_logging, event, format_bytes, logger
+from image_variants import DEFAULT_WIDTHS, build_image_variants
 from page_generator import generate_pages_recursive
+from precompress import ENCODINGS, precompress_tree, remove_precompressed
+from profiler import BuildProfiler
+from render_cache import RenderCache
+from static_sync import sync_static_files
+from watch import SiteWatcher, serve_directory
 
+# Build state that must survive between runs but is never published.
+CACHE_DIR = ".ssg-cache"
+PAGE_MANIFEST = os.path.join(CACHE_DIR, "pages.json")
+STATIC_MANIFEST = os.path.join(CACHE_DIR, "static.json")
+RENDER_CACHE_DIR = os.path.join(CACHE_DIR, "render")
+PRECOMPRESS_MANIFEST = os.path.join(CACHE_DIR, "precompress.json")
+IMAGE_MANIFEST = os.path.join(CACHE_DIR, "images.json")
+IMAGE_CACHE_DIR = os.path.join(CACHE_DIR, "images")
 
-def main():
-    # Get basepath from CLI argument, default to "/"
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
-    copy_static_files()
-    generate_pages_recursive("content", "template.html", "docs", basepath)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site.")
+    parser.add_argument(
+        "basepath", nargs="?", default="/", help='URL prefix for the site (default "/")'
+    )
+    parser.add_argument(
+        "--site-url",
+        metavar="URL",
+        help="where the site is published (e.g. https://example.com); writes "
+        "pages.json, sitemap.xml and feed.xml into the output",
+    )
+    parser.add_argument(
+        "--minify-html",
+        action="store_true",
+        help="strip whitespace and comments that do not render from the "
+        "templates (page content, including code blocks, is left as written)",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz (and .br, if the brotli module is installed) copies of "
+        "compressible outputs for servers that serve them directly",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="delete the output directory and rebuild everything from scratch",
+    )
+    parser.add_argument(
+        "--hash-static",
+        action="store_true",
+        help="compare static files by content hash instead of size and mtime",
+    )
+    parser.add_argument(
+        "--fingerprint",
+        action="store_true",
+        help="write static assets as name.<hash>.ext, point pages at those names "
+        "and list them in docs/assets.json, so they can be cached forever",
+    )
+    parser.add_argument(
+        "--responsive-images",
+        action="store_true",
+        help="write resized WebP variants of static images (needs Pillow) and "
+        "give images in pages a srcset, their size and lazy loading",
+    )
+    parser.add_argument(
+        "--image-widths",
+        default=",".join(str(width) for width in DEFAULT_WIDTHS),
+        metavar="W,...",
+        help="widths in pixels of the --responsive-images variants "
+        f"(default {','.join(str(width) for width in DEFAULT_WIDTHS)})",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help="hard-link static files into the output instead of copying them "
+        "(falls back to copying across filesystems)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render pages in N worker processes (0 uses every CPU)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="without --jobs, read and write pages in N background threads; "
+        "helps on slow or network-mounted disks (default 0: inline I/O)",
+    )
+    parser.add_argument(
+        "--no-render-cache",
+        action="store_true",
+        help="always parse markdown instead of reusing previously rendered content",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="after building, keep rebuilding pages and assets as they change",
+    )
+    parser.add_argument(
+        "--serve", action="store_true", help="serve the output directory over HTTP"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8888, help="port for --serve (default 8888)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.05,
+        help="seconds between checks for changes in --watch mode; with inotify "
+        "only template edits wait this long (default 0.05)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report time per build stage, the slowest pages and bytes read/written",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="number of slowest pages to list with --profile (default 10)",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="with --profile, also write cProfile stats to FILE (read with pstats)",
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-q",
+        "--quiet",
+        dest="verbosity",
+        action="store_const",
+        const="quiet",
+        help="only print warnings and errors",
+    )
+    verbosity.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbosity",
+        action="store_const",
+        const="verbose",
+        help="print a line for every page and file",
+    )
+    parser.set_defaults(verbosity="normal")
+    parser.add_argument(
+        "--events",
+        metavar="FILE",
+        help="write every build event to FILE as JSON lines",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs must be zero or a positive number")
+    if args.io_threads < 0:
+        parser.error("--io-threads must be zero or a positive number")
+    if args.fingerprint and args.watch:
+        # The watcher copies assets under their own names
+        parser.error("--fingerprint cannot be combined with --watch")
+    if args.responsive_images and args.watch:
+        # The watcher neither makes variants nor knows about them
+        parser.error("--responsive-images cannot be combined with --watch")
+    try:
+        args.image_widths = [int(width) for width in args.image_widths.split(",")]
+    except ValueError:
+        parser.error("--image-widths must be a comma-separated list of numbers")
+    if any(width <= 0 for width in args.image_widths):
+        parser.error("--image-widths must be positive")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.verbosity, args.events)
+    cache = None if args.no_render_cache else RenderCache(RENDER_CACHE_DIR)
+    if args.profile:
+        profile_build(args, cache)
+    else:
+        build(args, cache)
+
+    if not (args.watch or args.serve):
+        return
+
+    if args.serve:
+        serve_directory("docs", args.port)
+        logger.info(f"Serving docs/ at http://localhost:{args.port}/")
+    try:
+        if args.watch:
+            watcher = SiteWatcher(
+                "content",
+                "static",
+                "template.html",
+                "docs",
+                args.basepath,
+                cache,
+                link_static=args.link_static,
+                minify=args.minify_html,
+            )
+            watcher.run(args.interval)
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    if args.watch:
+        # Bring the build manifests up to date with what the watcher changed
+        args.clean = False
+        build(args, cache)
+
+
+def build(args, cache=None, profiler=None):
+    """Run one build, log its summary and return how long it took."""
+    start = time.perf_counter()
+    copy = copy_static_files
+    if profiler is not None:
+        copy = profiler.timed("copy_static_files", copy)
+    static = copy(
+        clean=args.clean,
+        use_hash=args.hash_static,
+        link=args.link_static,
+        fingerprint=args.fingerprint,
+    )
+    images = None
+    if args.responsive_images:
+        variants = build_image_variants
+        if profiler is not None:
+            variants = profiler.timed("image_variants", variants)
+        result = variants(
+            "static",
+            "docs",
+            IMAGE_CACHE_DIR,
+            IMAGE_MANIFEST,
+            widths=args.image_widths,
+            link=args.link_static,
+        )
+        log_images(result)
+        images = result.images
+    pages = generate_pages_recursive(
+        "content",
+        "template.html",
+        "docs",
+        args.basepath,
+        manifest_path=PAGE_MANIFEST,
+        jobs=args.jobs,
+        cache=cache,
+        io_threads=args.io_threads,
+        site_url=args.site_url,
+        minify=args.minify_html,
+        assets=static.assets,
+        images=images,
+    )
+    if args.precompress:
+        precompress = precompress_tree
+        if profiler is not None:
+            precompress = profiler.timed("precompress", precompress)
+        log_precompress(precompress("docs", PRECOMPRESS_MANIFEST))
+    else:
+        # Siblings left from an earlier --precompress build would be served
+        # in place of the pages and assets they no longer match
+        remove_precompressed("docs", PRECOMPRESS_MANIFEST)
+    elapsed = time.perf_counter() - start
+    log_summary(static, pages, elapsed)
+    return elapsed
+
+
+def log_images(result):
+    logger.info(
+        f"Image variants: {result.generated} encoded, {result.cached} from cache, "
+        f"{result.removed} stale removed",
+        extra=event(
+            "image_variants",
+            variants_encoded=result.generated,
+            variants_cached=result.cached,
+            variants_removed=result.removed,
+        ),
+    )
+
+
+def log_precompress(result):
+    encodings = ", ".join(suffix[1:] for suffix in ENCODINGS)
+    logger.info(
+        f"Precompressed {result.compressed} files as {encodings} "
+        f"({result.up_to_date} up to date, {result.not_smaller} not smaller, "
+        f"{result.removed} stale removed), "
+        f"wrote {format_bytes(result.bytes_written)}",
+        extra=event(
+            "precompressed",
+            files_compressed=result.compressed,
+            files_up_to_date=result.up_to_date,
+            files_not_smaller=result.not_smaller,
+            files_removed=result.removed,
+            bytes_written=result.bytes_written,
+        ),
+    )
+
+
+def log_summary(static, pages, elapsed):
+    written = pages.bytes_written + static.bytes_copied
+    logger.info(
+        f"Rendered {pages.rendered} pages, {pages.changed} changed on disk "
+        f"({pages.skipped} unchanged, {pages.removed} removed), "
+        f"copied {static.copied} files "
+        f"({static.skipped} unchanged, {static.removed} removed), "
+        f"wrote {format_bytes(written)} in {elapsed * 1000:.0f} ms",
+        extra=event(
+            "summary",
+            pages_rendered=pages.rendered,
+            pages_changed=pages.changed,
+            pages_skipped=pages.skipped,
+            pages_removed=pages.removed,
+            files_copied=static.copied,
+            files_skipped=static.skipped,
+            files_removed=static.removed,
+            bytes_written=written,
+            elapsed_ms=elapsed * 1000,
+        ),
+    )
+
+
+def profile_build(args, cache=None):
+    if args.jobs > 1:
+        logger.warning("--profile renders pages in a single process; ignoring --jobs")
+        args.jobs = 1
+    # Pages must be rendered through write_page for per-page timings
+    args.io_threads = 0
+
+    profiler = BuildProfiler()
+    profiler.install()
+    stats = cProfile.Profile() if args.profile_output else None
+    try:
+        if stats is not None:
+            stats.enable()
+        profiler.record("build", build(args, cache, profiler))
+    finally:
+        if stats is not None:
+            stats.disable()
+        profiler.uninstall()
+
+    print(profiler.report(args.profile_top))
+    if stats is not None:
+        stats.dump_stats(args.profile_output)
+        print(f"Wrote cProfile stats to {args.profile_output}")
+
+
+def copy_static_files(
+    src_dir="static",
+    dest_dir="docs",
+    clean=False,
+    use_hash=False,
+    link=False,
+    fingerprint=False,
+):
+    if not clean:
+        # Sync mode: only copy what changed and keep generated pages in place
+        return sync_static_files(
+            src_dir,
+            dest_dir,
+            STATIC_MANIFEST,
+            use_hash=use_hash,
+            link=link,
+            fingerprint=fingerprint,
+        )
 
-def copy_static_files(src_dir="static", dest_dir="docs"):
     # Step 1: Remove old docs directory
     if os.path.exists(dest_dir):
         shutil.rmtree(dest_dir)
-        print(f"Deleted old '{dest_dir}' directory.")
+        logger.info(f"Deleted old '{dest_dir}' directory.")
 
     # Step 2: Recreate destination directory
     os.mkdir(dest_dir)
 
-    # Step 3: Walk through source and copy
-    def recursive_copy(src, dst):
-        for item in os.listdir(src):
-            src_path = os.path.join(src, item)
-            dst_path = os.path.join(dst, item)
-
-            if os.path.isdir(src_path):
-                os.mkdir(dst_path)
-                recursive_copy(src_path, dst_path)
-            else:
-                shutil.copy(src_path, dst_path)
-                print(f"Copied: {src_path} -> {dst_path}")
-
-    recursive_copy(src_dir, dest_dir)
+    # Step 3: Copy everything; against an empty directory a sync copies it all
+    return sync_static_files(
+        src_dir, dest_dir, STATIC_MANIFEST, link=link, fingerprint=fingerprint
+    )
 
 
 if __name__ == "__main__":
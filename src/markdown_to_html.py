@@ -1,69 +1,128 @@
+from typing import Iterable, Iterator
 from htmlnode import ParentNode, LeafNode
-from inline_parser import text_to_textnodes
+from inline_parser import INLINE_MARKUP, text_to_textnodes
 from conversions import text_node_to_html_node
-from block_type import block_to_block_type, BlockType
-from block_parser import markdown_to_blocks
+from block_type import BlockType
+from block_tokenizer import Block, tokenize_blocks, tokenize_lines
 
 
-def markdown_to_html_node(markdown: str) -> ParentNode:
-    blocks = markdown_to_blocks(markdown)
-    children = []
+def text_to_children(
+    text: str, basepath: str = "/", assets=None, images=None
+) -> list:
+    # Most blocks have no inline markup at all; one scan of the text is
+    # enough to turn those into a raw text leaf without the inline parser.
+    if INLINE_MARKUP.search(text) is None:
+        return [LeafNode(None, text)] if text else []
+    inline_nodes = text_to_textnodes(text)
+    return [text_node_to_html_node(n, basepath, assets, images) for n in inline_nodes]
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
 
-        # Special case: multiple heading lines in one block
-        if block_type == BlockType.HEADING and "\n" in block:
-            for line in block.splitlines():
-                if not line.strip():
-                    continue
+def markdown_to_html_node(
+    markdown: str,
+    basepath: str = "/",
+    assets: dict | None = None,
+    images: dict | None = None,
+) -> ParentNode:
+    """
+    Convert a markdown document into a tree of HTML nodes wrapped in a <div>.
+    Root-relative link and image URLs are prefixed with basepath, and those
+    of fingerprinted assets are mapped through assets on the way. Images
+    described in images get their size, srcset and lazy loading.
+    """
+    blocks = tokenize_blocks(markdown)
+    nodes = blocks_to_html_nodes(blocks, basepath, assets, images)
+    return ParentNode("div", list(nodes))
+
+
+def blocks_to_html_nodes(
+    blocks: Iterable[Block],
+    basepath: str = "/",
+    assets: dict | None = None,
+    images: dict | None = None,
+) -> Iterator:
+    """Yield the HTML node for each block in turn (several for a heading block)."""
+    for block_type, lines in blocks:
+        # A heading block may hold several heading lines
+        if block_type == BlockType.HEADING:
+            for line in lines:
                 heading_level = line.count("#", 0, line.find(" "))
                 text = line[heading_level + 1 :].strip()
-                inline_nodes = text_to_textnodes(text)
-                html_children = [text_node_to_html_node(n) for n in inline_nodes]
-                children.append(ParentNode(f"h{heading_level}", html_children))
-            continue
-
-        if block_type == BlockType.PARAGRAPH:
-            text = block.replace("\n", " ")
-            inline_nodes = text_to_textnodes(text)
-            html_children = [text_node_to_html_node(n) for n in inline_nodes]
-            children.append(ParentNode("p", html_children))
-
-        elif block_type == BlockType.HEADING:
-            heading_level = block.count("#", 0, block.find(" "))
-            text = block[heading_level + 1 :].strip()
-            inline_nodes = text_to_textnodes(text)
-            html_children = [text_node_to_html_node(n) for n in inline_nodes]
-            children.append(ParentNode(f"h{heading_level}", html_children))
+                html_children = text_to_children(text, basepath, assets, images)
+                yield ParentNode(f"h{heading_level}", html_children)
+
+        elif block_type == BlockType.PARAGRAPH:
+            text = " ".join(lines)
+            html_children = text_to_children(text, basepath, assets, images)
+            yield ParentNode("p", html_children)
 
         elif block_type == BlockType.CODE:
-            code_lines = block.splitlines()
-            code = "\n".join(code_lines[1:-1]) + "\n"
-            children.append(ParentNode("pre", [LeafNode("code", code)]))
+            code = "\n".join(lines) + "\n"
+            yield ParentNode("pre", [LeafNode("code", code)])
 
         elif block_type == BlockType.QUOTE:
-            quote_text = " ".join([line[1:].lstrip() for line in block.splitlines()])
-            inline_nodes = text_to_textnodes(quote_text)
-            html_children = [text_node_to_html_node(n) for n in inline_nodes]
-            children.append(ParentNode("blockquote", html_children))
+            quote_text = " ".join([line[1:].lstrip() for line in lines])
+            html_children = text_to_children(quote_text, basepath, assets, images)
+            yield ParentNode("blockquote", html_children)
 
         elif block_type == BlockType.UNORDERED_LIST:
             li_nodes = []
-            for item in block.splitlines():
+            for item in lines:
                 item_text = item[2:]  # Remove "- "
-                inline_nodes = text_to_textnodes(item_text)
-                html_children = [text_node_to_html_node(n) for n in inline_nodes]
+                html_children = text_to_children(item_text, basepath, assets, images)
                 li_nodes.append(ParentNode("li", html_children))
-            children.append(ParentNode("ul", li_nodes))
+            yield ParentNode("ul", li_nodes)
 
         elif block_type == BlockType.ORDERED_LIST:
             li_nodes = []
-            for item in block.splitlines():
+            for item in lines:
                 _, item_text = item.split(". ", 1)
-                inline_nodes = text_to_textnodes(item_text)
-                html_children = [text_node_to_html_node(n) for n in inline_nodes]
+                html_children = text_to_children(item_text, basepath, assets, images)
                 li_nodes.append(ParentNode("li", html_children))
-            children.append(ParentNode("ol", li_nodes))
+            yield ParentNode("ol", li_nodes)
+
+
+def first_paragraph(nodes) -> str:
+    """Return the text of the first <p> among nodes, or "" if there is none."""
+    for node in nodes:
+        if node.tag == "p":
+            return node.text_content()
+    return ""
+
+
+class MarkdownFile:
+    """
+    Page content that is read from a markdown file while it is rendered.
+
+    It stands in for the HTMLNode returned by markdown_to_html_node when
+    passed to Template.render_into, and produces the same HTML. The file
+    is read a line at a time and each block is converted and written out
+    before the next is read, so only one block is held in memory at once.
+    The text of the first paragraph is kept in summary on the way.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        basepath: str = "/",
+        assets: dict | None = None,
+        images: dict | None = None,
+    ) -> None:
+        self.path = path
+        self.basepath = basepath
+        self.assets = assets
+        self.images = images
+        self.summary = ""
 
-    return ParentNode("div", children)
+    def render_into(self, write) -> None:
+        self.summary = ""
+        write("<div>")
+        with open(self.path, "r") as f:
+            blocks = tokenize_lines(f)
+            nodes = blocks_to_html_nodes(
+                blocks, self.basepath, self.assets, self.images
+            )
+            for node in nodes:
+                if not self.summary:
+                    self.summary = first_paragraph([node])
+                node.render_into(write)
+        write("</div>")
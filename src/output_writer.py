@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+from build_manifest import hash_file
+
+
+def temp_path(path: str) -> str:
+    """A temporary name next to path that no other process or thread uses."""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """
+    Write data to path unless the file already holds exactly that, and
+    return whether it was written.
+
+    The existing file is compared by size first and read only when the
+    sizes match, so an unchanged output keeps its mtime. A changed file is
+    written to a temporary file and moved into place with os.replace, so
+    readers (and a crashed build) never see it half written.
+    """
+    if _same_bytes(path, data):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = temp_path(path)
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _same_bytes(path, data) -> bool:
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, "rb") as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+
+class OutputFile:
+    """
+    Like write_if_changed, for output that is produced a piece at a time
+    and may be too large to hold in memory.
+
+    Text written to it goes to a temporary file next to path and is hashed
+    on the way. On a clean exit the existing file is compared by size and
+    then by hash: if it is identical the temporary file is discarded,
+    otherwise it replaces path. If the block raises, path is left alone.
+
+    Example:
+        with OutputFile("docs/index.html") as out:
+            template.render_into(out.write, title, content)
+        out.changed  # False if docs/index.html already held this page
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = 0
+        self.changed = False
+        self._tmp_path = temp_path(path)
+        self._digest = hashlib.sha256()
+        self._file = None
+
+    def __enter__(self) -> "OutputFile":
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self._tmp_path, "wb")
+        return self
+
+    def write(self, text: str) -> None:
+        data = text.encode()
+        self._file.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+        if exc_type is None and not self._same_file():
+            os.replace(self._tmp_path, self.path)
+            self.changed = True
+        else:
+            os.remove(self._tmp_path)
+
+    def _same_file(self) -> bool:
+        try:
+            if os.path.getsize(self.path) != self.size:
+                return False
+        except FileNotFoundError:
+            return False
+        return hash_file(self.path) == self._digest.hexdigest()
@@ -1,30 +1,127 @@
 import os
-from markdown_to_html import markdown_to_html_node
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+from markdown_to_html import MarkdownFile, first_paragraph, markdown_to_html_node
+from block_tokenizer import split_lines
+from build_log import event, init_worker_logging, logger, logging_settings
+from build_manifest import hash_file, load_manifest, save_manifest
+from fs_utils import remove_empty_parents
+from output_writer import OutputFile, write_if_changed
+from site_index import page_url, remove_site_index, write_site_index
+from template import Template, asset_digest
+
+# Sources at least this large are rendered straight from the file to the
+# output a block at a time, instead of being read and rendered whole.
+STREAM_THRESHOLD = 16 * 1024 * 1024
+
+# A file with this name in a content directory is the template for the
+# pages in that directory and below it.
+TEMPLATE_NAME = "template.html"
+
+
+class PageBuildResult(NamedTuple):
+    """
+    What generate_pages_recursive did, for the build summary. Of the
+    rendered pages, only changed ones were actually written to disk.
+    """
+
+    rendered: int = 0
+    skipped: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+    changed: int = 0
+
+
+class RenderedPage(NamedTuple):
+    """
+    What write_page produced, for the build summary and the site index.
+    bytes_written is 0 when the output already held the same page.
+    """
+
+    title: str
+    summary: str
+    bytes_written: int
 
 
 def generate_page(from_path, template_path, dest_path, basepath):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    return write_page(from_path, Template.load(template_path, basepath), dest_path)
+
+
+def write_page(from_path, template, dest_path, cache=None):
+    """
+    Render one markdown file through an already compiled Template.
+    With a RenderCache, previously rendered content is reused as is.
+    Sources of STREAM_THRESHOLD bytes or more are streamed instead and
+    bypass the cache. Returns a RenderedPage.
+    """
+    _log_page(from_path, template, dest_path)
+
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        return _stream_page(from_path, template, dest_path)
 
     with open(from_path, "r") as f:
         md = f.read()
+    title, summary, parts = render_page(md, template, cache)
+    return RenderedPage(title, summary, write_output(dest_path, parts))
+
+
+def render_page(md, template, cache=None):
+    """
+    Render markdown through a Template. Returns the page title, its
+    summary (the text of the first paragraph) and the page as fragments.
+    """
+    cached = None
+    if cache is not None:
+        key = cache.key(md, template.basepath, template.asset_digest)
+        cached = cache.get(key)
+
+    if cached is not None:
+        title, content, summary = cached
+    else:
+        content = markdown_to_html_node(
+            md, template.basepath, template.assets, template.images
+        )
+        title = extract_title(md)
+        summary = first_paragraph(content.children)
+        if cache is not None:
+            content = content.to_html()
+            cache.put(key, title, content, summary)
+
+    parts = []
+    template.render_into(parts.append, title, content)
+    return title, summary, parts
 
-    with open(template_path, "r") as f:
-        template = f.read()
 
-    content_html = markdown_to_html_node(md).to_html()
-    title = extract_title(md)
+def write_output(dest_path, parts) -> int:
+    """
+    Write page fragments to dest_path unless it already holds the same
+    page, and return the number of bytes written (0 if it was unchanged).
+    """
+    data = "".join(parts).encode()
+    return len(data) if write_if_changed(dest_path, data) else 0
+
 
-    result = template.replace("{{ Title }}", title).replace(
-        "{{ Content }}", content_html
+def _log_page(from_path, template, dest_path):
+    logger.debug(
+        "Generating page from %s to %s using %s",
+        from_path,
+        dest_path,
+        template.path,
+        extra=event("page_rendered", source=from_path, dest=dest_path),
     )
 
-    # Replace href and src with basepath
-    result = result.replace('href="/', f'href="{basepath}')
-    result = result.replace('src="/', f'src="{basepath}')
 
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, "w") as f:
-        f.write(result)
+def _stream_page(from_path, template, dest_path):
+    with open(from_path, "r") as f:
+        title = find_title(f)
+    content = MarkdownFile(
+        from_path, template.basepath, template.assets, template.images
+    )
+
+    with OutputFile(dest_path) as out:
+        template.render_into(out.write, title, content)
+    return RenderedPage(title, content.summary, out.size if out.changed else 0)
 
 
 def extract_title(markdown: str) -> str:
@@ -32,20 +129,375 @@ def extract_title(markdown: str) -> str:
     This function returns the text of the first line that
     starts with a single #.
     """
-    for line in markdown.splitlines():
+    return find_title(split_lines(markdown))
+
+
+def find_title(lines) -> str:
+    """Like extract_title, but over any iterable of lines, such as a file."""
+    for line in lines:
         if line.startswith("# "):
             return line[2:].strip()
     raise Exception("No H1 title found in markdown.")
 
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
+def page_dest_path(from_path, dir_path_content, dest_dir_path) -> str:
+    """Return where collect_pages would put the output for one markdown file."""
+    rel_dir = os.path.relpath(os.path.dirname(from_path), dir_path_content)
+    return os.path.normpath(os.path.join(dest_dir_path, rel_dir, "index.html"))
+
+
+def collect_pages(dir_path_content, dest_dir_path) -> list[tuple[str, str]]:
+    """
+    Walk the content directory and return (source, destination) pairs
+    for every markdown file, in the order they would be rendered.
+    """
+    pages = []
     for entry in os.listdir(dir_path_content):
         entry_path = os.path.join(dir_path_content, entry)
         dest_path = os.path.join(dest_dir_path, entry)
 
         if os.path.isdir(entry_path):
-            generate_pages_recursive(entry_path, template_path, dest_path, basepath)
+            pages.extend(collect_pages(entry_path, dest_path))
 
         elif entry.endswith(".md"):
             output_file_path = os.path.join(dest_dir_path, "index.html")
-            generate_page(entry_path, template_path, output_file_path, basepath)
+            pages.append((entry_path, output_file_path))
+    return pages
+
+
+def find_template(from_path, dir_path_content, default_path) -> str:
+    """
+    Return the template for a page: the nearest TEMPLATE_NAME in the
+    page's directory or one of its parents within dir_path_content,
+    or default_path if there is none.
+    """
+    root = os.path.normpath(dir_path_content)
+    directory = os.path.dirname(os.path.normpath(from_path))
+    while True:
+        candidate = os.path.join(directory, TEMPLATE_NAME)
+        if os.path.isfile(candidate):
+            return candidate
+        if directory == root or not directory.startswith(root + os.sep):
+            return default_path
+        directory = os.path.dirname(directory)
+
+
+def load_templates(
+    pages,
+    dir_path_content,
+    template_path,
+    basepath,
+    minify=False,
+    assets=None,
+    images=None,
+):
+    """
+    Choose a template for every (source, destination) pair and load each
+    template once (see Template for minify, assets and images). Returns
+    ({source: template path}, {path: Template}).
+    """
+    page_templates = {
+        from_path: find_template(from_path, dir_path_content, template_path)
+        for from_path, _ in pages
+    }
+    templates = {
+        path: Template.load(path, basepath, minify, assets, images)
+        for path in set(page_templates.values())
+    }
+    return page_templates, templates
+
+
+def generate_pages_recursive(
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    basepath,
+    manifest_path=None,
+    jobs=1,
+    cache=None,
+    io_threads=0,
+    site_url=None,
+    minify=False,
+    assets=None,
+    images=None,
+):
+    """
+    Render every markdown file under dir_path_content.
+
+    Each page is rendered with the nearest TEMPLATE_NAME in its directory
+    or above it within dir_path_content, and with template_path where
+    there is none.
+
+    When manifest_path is given the build is incremental: pages whose
+    source, template (including its partials) and basepath are unchanged
+    since the last build (and whose output still exists) are skipped, and
+    outputs of deleted sources are removed. The manifest records which
+    template each page used and which files each template was built from,
+    so an edit to one partial only rebuilds the pages that include it.
+
+    With jobs > 1 pages are rendered in that many worker processes, and
+    with a RenderCache pages whose markdown has been rendered before are
+    not parsed again. With io_threads, a single-process build reads and
+    writes files in that many background threads.
+
+    Every page's title, URL, source mtime and first paragraph are collected
+    while it is rendered (and kept in the manifest for skipped pages). With
+    site_url, they are written out as a JSON page index, a sitemap and an
+    RSS feed once all pages are done. With manifest_path, a build without
+    site_url removes those files again if an earlier build wrote them.
+
+    With minify, templates are minified when they are loaded (see
+    Template). Switching it on or off rebuilds every page.
+
+    With assets, a map of root-relative asset URLs to fingerprinted ones
+    (see sync_static_files), references to those assets in templates and
+    markdown point at the fingerprinted names. With images (see
+    build_image_variants), images in markdown get their size, srcset and
+    lazy loading. Any change to either map rebuilds every page; pages
+    whose HTML comes out the same are not rewritten.
+
+    Returns a PageBuildResult.
+    """
+    pages = collect_pages(dir_path_content, dest_dir_path)
+    page_templates, templates = load_templates(
+        pages, dir_path_content, template_path, basepath, minify, assets, images
+    )
+
+    if manifest_path is None:
+        work = [
+            (from_path, dest_path, templates[page_templates[from_path]])
+            for from_path, dest_path in pages
+        ]
+        rendered = render_pages(work, jobs, cache, io_threads)
+        if cache is not None:
+            cache.prune()
+        if site_url is not None:
+            pages_seen = [
+                (from_path, dest_path, page.title, page.summary)
+                for (from_path, dest_path), page in zip(pages, rendered)
+            ]
+            _write_site_index(pages_seen, dest_dir_path, basepath, site_url)
+        return PageBuildResult(
+            rendered=len(pages),
+            bytes_written=sum(page.bytes_written for page in rendered),
+            changed=sum(1 for page in rendered if page.bytes_written),
+        )
+
+    previous = load_manifest(manifest_path)
+    settings = {
+        "basepath": basepath,
+        "minify": minify,
+        "assets": asset_digest(assets, images),
+    }
+    if all(previous.get(key) == value for key, value in settings.items()):
+        previous_pages = previous.get("pages", {})
+        previous_templates = previous.get("templates", {})
+    else:
+        previous_pages = {}
+        previous_templates = {}
+
+    # template path -> {dependency path: hash}; partials may be shared
+    hashes = {}
+    graph = {}
+    for path, template in templates.items():
+        for dependency in template.dependencies:
+            if dependency not in hashes:
+                hashes[dependency] = hash_file(dependency)
+        graph[path] = {dep: hashes[dep] for dep in template.dependencies}
+
+    current_pages = {}
+    outdated = []
+    for from_path, dest_path in pages:
+        page_template = page_templates[from_path]
+        entry = {
+            "hash": hash_file(from_path),
+            "dest": dest_path,
+            "template": page_template,
+        }
+        previous_entry = previous_pages.get(from_path, {})
+        if (
+            any(previous_entry.get(key) != value for key, value in entry.items())
+            or previous_templates.get(page_template) != graph[page_template]
+            or not os.path.exists(dest_path)
+        ):
+            outdated.append((from_path, dest_path, templates[page_template]))
+        else:
+            entry["title"] = previous_entry["title"]
+            entry["summary"] = previous_entry["summary"]
+        current_pages[from_path] = entry
+
+    rendered = render_pages(outdated, jobs, cache, io_threads)
+    for (from_path, _, _), page in zip(outdated, rendered):
+        current_pages[from_path]["title"] = page.title
+        current_pages[from_path]["summary"] = page.summary
+    if cache is not None:
+        cache.prune()
+
+    removed = remove_stale_pages(
+        previous.get("pages", {}), current_pages, dest_dir_path
+    )
+    site_index = {}
+    if site_url is not None:
+        pages_seen = [
+            (from_path, entry["dest"], entry["title"], entry["summary"])
+            for from_path, entry in current_pages.items()
+        ]
+        site_index = _write_site_index(pages_seen, dest_dir_path, basepath, site_url)
+    else:
+        remove_site_index(previous.get("site_index", {}), dest_dir_path)
+    save_manifest(
+        manifest_path,
+        {
+            **settings,
+            "templates": graph,
+            "pages": current_pages,
+            "site_index": site_index,
+        },
+    )
+    return PageBuildResult(
+        rendered=len(outdated),
+        skipped=len(pages) - len(outdated),
+        removed=removed,
+        bytes_written=sum(page.bytes_written for page in rendered),
+        changed=sum(1 for page in rendered if page.bytes_written),
+    )
+
+
+def _write_site_index(pages_seen, dest_dir_path, basepath, site_url):
+    # pages_seen holds (source, destination, title, summary) for every page
+    return write_site_index(
+        [
+            {
+                "url": page_url(dest_path, dest_dir_path, basepath),
+                "title": title,
+                "summary": summary,
+                "mtime": os.path.getmtime(from_path),
+            }
+            for from_path, dest_path, title, summary in pages_seen
+        ],
+        dest_dir_path,
+        site_url,
+    )
+
+
+def render_pages(pages, jobs=1, cache=None, io_threads=0):
+    """
+    Render (source, destination, Template) triples, serially (optionally
+    with file I/O in io_threads background threads) or in a process pool.
+    Either way a failure is reported with the source file that caused it.
+    Returns a RenderedPage for each page, in order.
+    """
+    if not pages:
+        return []
+    work = [
+        (from_path, template, dest_path, cache)
+        for from_path, dest_path, template in pages
+    ]
+    if jobs <= 1 or len(work) <= 1:
+        if io_threads > 0 and len(work) > 1:
+            return _render_pages_pipelined(work, io_threads)
+        return [_render_page_job(item) for item in work]
+
+    # A few chunks per worker keeps the pool busy without paying
+    # inter-process overhead for every single page.
+    chunksize = max(1, len(work) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker_logging,
+        initargs=(logging_settings(),),
+    ) as executor:
+        return list(executor.map(_render_page_job, work, chunksize=chunksize))
+
+
+def _render_pages_pipelined(work, io_threads):
+    """
+    Render pages one by one in this thread while io_threads threads read
+    upcoming sources and write finished pages, so that the CPU does not
+    wait on the disk. At most 2 * io_threads sources are read ahead and
+    as many pages wait to be written, which keeps memory bounded.
+    """
+    window = 2 * io_threads
+    results = []
+    pending = iter(work)
+    reads = deque()
+    writes = deque()
+
+    with ThreadPoolExecutor(max_workers=io_threads) as pool:
+
+        def read_ahead():
+            while len(reads) < window:
+                item = next(pending, None)
+                if item is None:
+                    return
+                reads.append((item, pool.submit(_read_source, item[0])))
+
+        read_ahead()
+        while reads:
+            (from_path, template, dest_path, cache), source = reads.popleft()
+            read_ahead()
+            try:
+                md = source.result()
+                _log_page(from_path, template, dest_path)
+                if md is None:
+                    results.append(_stream_page(from_path, template, dest_path))
+                else:
+                    title, summary, parts = render_page(md, template, cache)
+                    write = pool.submit(write_output, dest_path, parts)
+                    writes.append((len(results), from_path, write))
+                    results.append(RenderedPage(title, summary, 0))
+            except Exception as e:
+                raise Exception(f"Failed to generate page from {from_path}: {e}") from e
+            while writes and (len(writes) > window or writes[0][2].done()):
+                _finish_write(results, *writes.popleft())
+
+        while writes:
+            _finish_write(results, *writes.popleft())
+    return results
+
+
+def _read_source(from_path):
+    # Sources that will be streamed are left for the renderer to read
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        return None
+    with open(from_path, "r") as f:
+        return f.read()
+
+
+def _finish_write(results, index, from_path, write):
+    try:
+        size = write.result()
+    except Exception as e:
+        raise Exception(f"Failed to generate page from {from_path}: {e}") from e
+    results[index] = results[index]._replace(bytes_written=size)
+
+
+def _render_page_job(item):
+    from_path, template, dest_path, cache = item
+    try:
+        return write_page(from_path, template, dest_path, cache)
+    except Exception as e:
+        raise Exception(f"Failed to generate page from {from_path}: {e}") from e
+
+
+def remove_stale_pages(previous_pages, current_pages, dest_dir_path):
+    """
+    Delete outputs of sources that existed in the previous build but are
+    gone now, along with any directories that are left empty.
+    Returns how many outputs were removed.
+    """
+    live_outputs = {entry["dest"] for entry in current_pages.values()}
+    removed = 0
+
+    for from_path, entry in previous_pages.items():
+        dest_path = entry["dest"]
+        if from_path in current_pages or dest_path in live_outputs:
+            continue
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+            removed += 1
+            logger.info(
+                f"Removed stale page {dest_path}",
+                extra=event("page_removed", source=from_path, dest=dest_path),
+            )
+        remove_empty_parents(dest_path, dest_dir_path)
+    return removed
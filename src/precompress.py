@@ -0,0 +1,210 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from build_log import event, logger
+from build_manifest import load_manifest, save_manifest
+from output_writer import temp_path
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Formats that are compressed already; a second pass only wastes time
+INCOMPRESSIBLE = frozenset(
+    [".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".ico", ".woff"]
+    + [".woff2", ".zip", ".gz", ".br", ".mp3", ".mp4", ".webm"]
+)
+
+# Files smaller than this gain nothing worth a second request path
+MIN_SIZE = 256
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0 keeps the output identical from build to build
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+# file suffix -> compressor
+ENCODINGS = {".gz": _gzip}
+if brotli is not None:
+    ENCODINGS[".br"] = _brotli
+
+
+class PrecompressResult(NamedTuple):
+    """What precompress_tree did, for the build summary."""
+
+    compressed: int = 0
+    up_to_date: int = 0
+    removed: int = 0
+    bytes_written: int = 0
+    # Files tried that got no sibling, since none would have been smaller
+    not_smaller: int = 0
+
+
+def precompress_tree(directory, manifest_path=None, workers=None):
+    """
+    Write a compressed sibling (index.html.gz, and index.html.br when the
+    brotli module is installed) next to every compressible file under
+    directory, using a pool of threads (zlib and brotli release the GIL
+    while they work).
+
+    Each sibling takes its source's mtime, so a sibling whose mtime still
+    matches is up to date and skipped. Already compressed formats and tiny
+    files are left alone, as are files that would not get smaller. When
+    manifest_path is given it remembers which siblings were written, so
+    that those whose source is gone are removed, and which would not have
+    been smaller, so that those are not compressed again until their
+    source changes.
+
+    Returns a PrecompressResult.
+    """
+    sources = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if is_compressible(path):
+                sources.append(path)
+
+    # sibling path -> source mtime, for siblings that would not be smaller
+    known = {}
+    if manifest_path is not None:
+        for rel_path, mtime_ns in (
+            load_manifest(manifest_path).get("not_smaller", {}).items()
+        ):
+            known[os.path.join(directory, rel_path)] = mtime_ns
+
+    siblings = set()
+    not_smaller = {}
+    compressed = up_to_date = not_smaller_files = bytes_written = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda path: compress_file(path, known), sources)
+        for written, current, skipped in results:
+            siblings.update(current)
+            not_smaller.update(skipped)
+            if written:
+                compressed += 1
+                bytes_written += written
+            elif written is None:
+                up_to_date += 1
+            else:
+                not_smaller_files += 1
+
+    removed = 0
+    if manifest_path is not None:
+        removed = _remove_siblings(directory, manifest_path, keep=siblings)
+        save_manifest(
+            manifest_path,
+            {
+                "files": sorted(os.path.relpath(p, directory) for p in siblings),
+                "not_smaller": {
+                    os.path.relpath(p, directory): mtime_ns
+                    for p, mtime_ns in sorted(not_smaller.items())
+                },
+            },
+        )
+    return PrecompressResult(
+        compressed, up_to_date, removed, bytes_written, not_smaller_files
+    )
+
+
+def remove_precompressed(directory, manifest_path) -> int:
+    """
+    Remove every sibling that precompress_tree recorded in manifest_path,
+    for builds that no longer precompress, so that no stale sibling is
+    served in place of a changed file. Returns how many were removed.
+    """
+    removed = _remove_siblings(directory, manifest_path, keep=set())
+    if os.path.exists(manifest_path):
+        save_manifest(manifest_path, {"files": []})
+    return removed
+
+
+def _remove_siblings(directory, manifest_path, keep) -> int:
+    removed = 0
+    for rel_path in load_manifest(manifest_path).get("files", []):
+        path = os.path.join(directory, rel_path)
+        if path not in keep and os.path.exists(path):
+            os.remove(path)
+            removed += 1
+            logger.info(f"Removed: {path}", extra=event("file_removed", dest=path))
+    return removed
+
+
+def is_compressible(path) -> bool:
+    if os.path.splitext(path)[1].lower() in INCOMPRESSIBLE:
+        return False
+    try:
+        return os.path.getsize(path) >= MIN_SIZE
+    except FileNotFoundError:
+        return False
+
+
+def compress_file(path, not_smaller=None):
+    """
+    Bring the compressed siblings of path up to date. not_smaller maps
+    siblings found not worth writing by an earlier call to the source
+    mtime they were found for; those are not tried again while the mtime
+    is the same.
+
+    Returns the bytes written (None if every sibling was already current),
+    the paths of the siblings that path now has, and the siblings that
+    would not be smaller than path (mapped to its mtime).
+    """
+    not_smaller = not_smaller or {}
+    stat = os.stat(path)
+    skipped = {}
+    outdated = []
+    for suffix in ENCODINGS:
+        sibling = path + suffix
+        if not_smaller.get(sibling) == stat.st_mtime_ns:
+            skipped[sibling] = stat.st_mtime_ns
+        elif _stamp(sibling) != stat.st_mtime_ns:
+            outdated.append(suffix)
+    current = [
+        path + suffix
+        for suffix in ENCODINGS
+        if suffix not in outdated and path + suffix not in skipped
+    ]
+    if not outdated:
+        return None, current, skipped
+
+    with open(path, "rb") as f:
+        data = f.read()
+    written = 0
+    for suffix in outdated:
+        sibling = path + suffix
+        packed = ENCODINGS[suffix](data)
+        if len(packed) >= len(data):
+            # Not worth serving; make sure no stale sibling is left behind
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            skipped[sibling] = stat.st_mtime_ns
+            continue
+        tmp_path = temp_path(sibling)
+        with open(tmp_path, "wb") as f:
+            f.write(packed)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_path, sibling)
+        current.append(sibling)
+        written += len(packed)
+        logger.debug(
+            "Compressed: %s (%d -> %d bytes)",
+            sibling,
+            len(data),
+            len(packed),
+            extra=event("file_compressed", dest=sibling, bytes=len(packed)),
+        )
+    return written, current, skipped
+
+
+def _stamp(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,192 @@
+import functools
+import os
+import threading
+import time
+import htmlnode
+import image_variants
+import markdown_to_html
+import page_generator
+import precompress
+import site_index
+import static_sync
+import template
+import watch
+
+
+class BuildProfiler:
+    """
+    Collects per-stage timings, per-page timings and I/O volume for a build.
+
+    Instrumentation is installed by swapping wrapped versions of the stage
+    functions into the modules that call them, and removed again by
+    uninstall(). A build without --profile runs the original functions and
+    pays nothing. Stage totals are inclusive, so nested stages (such as
+    text_to_textnodes inside markdown_to_html_node) overlap.
+
+    Pages must be rendered in this process (jobs=1) to be measured.
+
+    Example:
+        profiler = BuildProfiler()
+        profiler.install()
+        try:
+            build()
+        finally:
+            profiler.uninstall()
+        print(profiler.report())
+    """
+
+    def __init__(self) -> None:
+        self.totals = {}
+        self.calls = {}
+        self.pages = []
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._patched = []
+        # Static files are copied, and outputs compressed, in pools of threads
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    def timed(self, stage: str, fn):
+        """Return fn wrapped so that every call is added to stage."""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    def _timed_page(self, fn):
+        @functools.wraps(fn)
+        def wrapper(from_path, page_template, dest_path, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                page = fn(from_path, page_template, dest_path, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.record("generate_page", elapsed)
+                self.pages.append((elapsed, from_path))
+                self.bytes_read += _size(from_path)
+            # Zero when the page on disk was already the same
+            self.bytes_written += page.bytes_written
+            return page
+
+        return wrapper
+
+    def _counted_copy(self, fn):
+        @functools.wraps(fn)
+        def wrapper(src_path, dst_path, *args, **kwargs):
+            # The bytes actually copied; zero for a hard link
+            size = fn(src_path, dst_path, *args, **kwargs)
+            with self._lock:
+                self.bytes_read += size
+                self.bytes_written += size
+            return size
+
+        return wrapper
+
+    def _counted_write(self, fn):
+        @functools.wraps(fn)
+        def wrapper(path, data, *args, **kwargs):
+            written = fn(path, data, *args, **kwargs)
+            if written:
+                self.bytes_written += len(data)
+            return written
+
+        return wrapper
+
+    def _counted_compress(self, fn):
+        @functools.wraps(fn)
+        def wrapper(path, *args, **kwargs):
+            result = fn(path, *args, **kwargs)
+            written = result[0]
+            # None when every sibling was current and the source was not read
+            if written is not None:
+                with self._lock:
+                    self.bytes_read += _size(path)
+                    self.bytes_written += written
+            return result
+
+        return wrapper
+
+    def _patch(self, owner, name, wrapped) -> None:
+        # Remember whether the attribute was inherited so uninstall can
+        # remove our override instead of pinning the parent's version
+        own = name in vars(owner)
+        self._patched.append((owner, name, getattr(owner, name), own))
+        setattr(owner, name, wrapped)
+
+    def install(self) -> None:
+        self._patch(
+            page_generator,
+            "markdown_to_html_node",
+            self.timed("markdown_to_html_node", page_generator.markdown_to_html_node),
+        )
+        self._patch(
+            markdown_to_html,
+            "text_to_textnodes",
+            self.timed("text_to_textnodes", markdown_to_html.text_to_textnodes),
+        )
+        # Pages are rendered through the template; the render cache uses to_html
+        self._patch(
+            template.Template,
+            "render_into",
+            self.timed("to_html", template.Template.render_into),
+        )
+        self._patch(
+            htmlnode.ParentNode,
+            "to_html",
+            self.timed("to_html", htmlnode.ParentNode.to_html),
+        )
+        self._patch(
+            page_generator, "write_page", self._timed_page(page_generator.write_page)
+        )
+        # Every module that copies files imported copy_file by name
+        for module in (static_sync, image_variants, watch):
+            self._patch(module, "copy_file", self._counted_copy(module.copy_file))
+        self._patch(
+            site_index,
+            "write_if_changed",
+            self._counted_write(site_index.write_if_changed),
+        )
+        self._patch(
+            precompress,
+            "compress_file",
+            self._counted_compress(precompress.compress_file),
+        )
+
+    def uninstall(self) -> None:
+        while self._patched:
+            owner, name, original, own = self._patched.pop()
+            if own:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+
+    def report(self, slowest: int = 10) -> str:
+        lines = ["Build profile:", f"  {'stage':<24}{'calls':>8}{'total ms':>12}"]
+        for stage, seconds in sorted(self.totals.items(), key=lambda item: -item[1]):
+            lines.append(
+                f"  {stage:<24}{self.calls[stage]:>8}{seconds * 1000:>12.1f}"
+            )
+        lines.append(
+            f"  bytes read: {self.bytes_read:,}, bytes written: {self.bytes_written:,}"
+        )
+        if self.pages:
+            lines.append(f"  slowest {min(slowest, len(self.pages))} pages:")
+            for seconds, path in sorted(self.pages, reverse=True)[:slowest]:
+                lines.append(f"  {seconds * 1000:>10.1f} ms  {path}")
+        return "\n".join(lines)
+
+
+def _size(path) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
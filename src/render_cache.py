@@ -0,0 +1,87 @@
+import json
+import os
+from build_manifest import hash_bytes
+
+# Bump this whenever a change to the markdown parser or HTML rendering
+# changes its output, so that entries rendered by the old code are no
+# longer found (they age out through normal eviction).
+PARSER_VERSION = 3
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class RenderCache:
+    """
+    An on-disk cache from markdown content to its rendered HTML, title and
+    summary (the text of its first paragraph).
+
+    Entries are keyed by a hash of the parser version, the basepath, the
+    digest of the fingerprinted asset names in use (if any) and the
+    markdown itself, so unchanged pages can be re-wrapped in a new template
+    without parsing them again. Each entry is a small JSON file; reading an
+    entry refreshes its mtime, and prune() evicts the least recently used
+    entries once the cache grows past max_bytes.
+
+    The object holds no open handles, so it can be handed to worker
+    processes and used from several of them at once.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, markdown: str, basepath: str, asset_digest: str = "") -> str:
+        header = f"{PARSER_VERSION}\0{basepath}\0"
+        if asset_digest:
+            header += f"{asset_digest}\0"
+        header = header.encode()
+        return hash_bytes(header + markdown.encode())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key: str) -> tuple[str, str, str] | None:
+        """Return (title, content_html, summary) for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry["title"], entry["html"], entry["summary"]
+
+    def put(self, key: str, title: str, content_html: str, summary: str = "") -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Workers may race on the same entry; each writes its own temp file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"title": title, "html": content_html, "summary": summary}, f
+            )
+        os.replace(tmp_path, path)
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,128 @@
+import json
+import os
+import time
+from email.utils import formatdate
+from xml.sax.saxutils import escape
+from build_log import event, logger
+from build_manifest import hash_bytes, hash_file
+from output_writer import write_if_changed
+
+INDEX_NAME = "pages.json"
+SITEMAP_NAME = "sitemap.xml"
+FEED_NAME = "feed.xml"
+
+# The feed lists only the most recently modified pages
+FEED_ITEMS = 20
+
+
+def page_url(dest_path, dest_dir_path, basepath) -> str:
+    """Return the URL path a page is served at, e.g. "/ssg/blog/tom/"."""
+    rel_dir = os.path.relpath(os.path.dirname(dest_path), dest_dir_path)
+    if rel_dir == ".":
+        return basepath
+    return basepath + rel_dir.replace(os.sep, "/") + "/"
+
+
+def write_site_index(pages, dest_dir_path, site_url) -> dict[str, str]:
+    """
+    Write the JSON page index, sitemap and RSS feed into dest_dir_path.
+
+    pages holds a dict per page with its url (a path, as from page_url),
+    title, summary and mtime (seconds since the epoch). site_url is the
+    scheme and host the site is published at, such as
+    "https://example.com", and makes the sitemap and feed URLs absolute.
+
+    Returns the names of the files written, mapped to the hash of their
+    content, for remove_site_index.
+    """
+    site_url = site_url.rstrip("/")
+    pages = sorted(pages, key=lambda page: page["url"])
+
+    index = [
+        {
+            "url": page["url"],
+            "title": page["title"],
+            "summary": page["summary"],
+            "modified": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(page["mtime"])),
+        }
+        for page in pages
+    ]
+    outputs = {
+        INDEX_NAME: json.dumps({"pages": index}, indent=2),
+        SITEMAP_NAME: render_sitemap(pages, site_url),
+        FEED_NAME: render_feed(pages, site_url),
+    }
+    written = {}
+    for name, text in outputs.items():
+        data = text.encode()
+        write_if_changed(os.path.join(dest_dir_path, name), data)
+        written[name] = hash_bytes(data)
+    return written
+
+
+def remove_site_index(written, dest_dir_path) -> int:
+    """
+    Remove the files an earlier write_site_index wrote (written is what it
+    returned), for builds without a site URL, so that no stale index,
+    sitemap or feed stays published. A file that has changed since, such
+    as one of the same name copied from the static directory, is left
+    alone. Returns how many were removed.
+    """
+    removed = 0
+    for name, digest in written.items():
+        path = os.path.join(dest_dir_path, name)
+        if os.path.exists(path) and hash_file(path) == digest:
+            os.remove(path)
+            removed += 1
+            logger.info(f"Removed: {path}", extra=event("file_removed", dest=path))
+    return removed
+
+
+def render_sitemap(pages, site_url) -> str:
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">',
+    ]
+    for page in pages:
+        lastmod = time.strftime("%Y-%m-%d", time.gmtime(page["mtime"]))
+        lines.append(
+            f"  <url><loc>{escape(site_url + page['url'])}</loc>"
+            f"<lastmod>{lastmod}</lastmod></url>"
+        )
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def render_feed(pages, site_url) -> str:
+    """
+    Render an RSS 2.0 feed of the most recently modified pages. The
+    channel takes its title and description from the shortest URL (the
+    home page).
+    """
+    home = min(pages, key=lambda page: len(page["url"]), default=None)
+    title = home["title"] if home else site_url
+    description = home["summary"] if home else ""
+    link = site_url + (home["url"] if home else "/")
+
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0">',
+        "<channel>",
+        f"  <title>{escape(title)}</title>",
+        f"  <link>{escape(link)}</link>",
+        f"  <description>{escape(description)}</description>",
+    ]
+    recent = sorted(pages, key=lambda page: page["mtime"], reverse=True)
+    for page in recent[:FEED_ITEMS]:
+        url = escape(site_url + page["url"])
+        lines += [
+            "  <item>",
+            f"    <title>{escape(page['title'])}</title>",
+            f"    <link>{url}</link>",
+            f"    <guid>{url}</guid>",
+            f"    <pubDate>{formatdate(page['mtime'], usegmt=True)}</pubDate>",
+            f"    <description>{escape(page['summary'])}</description>",
+            "  </item>",
+        ]
+    lines += ["</channel>", "</rss>"]
+    return "\n".join(lines) + "\n"
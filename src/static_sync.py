@@ -0,0 +1,227 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from build_log import event, logger
+from build_manifest import hash_file, load_manifest, save_manifest
+from fs_utils import remove_empty_parents
+from output_writer import temp_path, write_if_changed
+
+COPY_CHUNK = 1 << 20
+
+
+# Static files that are referenced by URL from pages and templates, and
+# get fingerprinted names with --fingerprint. Others (robots.txt, HTML,
+# favicon.ico) must keep their well-known names.
+FINGERPRINT_EXTENSIONS = frozenset(
+    [".css", ".js", ".mjs", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif"]
+    + [".svg", ".woff", ".woff2", ".ttf", ".otf"]
+)
+FINGERPRINT_LENGTH = 10
+
+# Written to the root of dest_dir when fingerprinting: {url: fingerprinted url}
+ASSET_MANIFEST_NAME = "assets.json"
+
+
+class SyncResult(NamedTuple):
+    """What sync_static_files did, for the build summary."""
+
+    copied: int = 0
+    skipped: int = 0
+    removed: int = 0
+    bytes_copied: int = 0
+    # Root-relative URL -> fingerprinted URL, when fingerprinting
+    assets: dict | None = None
+
+
+def sync_static_files(
+    src_dir,
+    dest_dir,
+    manifest_path=None,
+    use_hash=False,
+    link=False,
+    threads=8,
+    fingerprint=False,
+):
+    """
+    Bring dest_dir up to date with src_dir without touching anything else
+    in it (such as generated pages).
+
+    A file is copied when it is missing from dest_dir or differs in size or
+    modification time (or, with use_hash, in content). When manifest_path
+    is given it remembers which files came from src_dir, so that files
+    removed from src_dir are also removed from dest_dir.
+
+    Files are checked and copied in a pool of threads. With link, files
+    are hard-linked instead of copied where the filesystem allows it.
+
+    With fingerprint, assets (see FINGERPRINT_EXTENSIONS) are written as
+    name.<hash>.ext, where hash comes from their content, so only changed
+    assets get new names and the old ones are removed. The mapping from
+    original to fingerprinted URLs is returned in SyncResult.assets and
+    written to ASSET_MANIFEST_NAME in dest_dir. The manifest keeps each
+    asset's hash with its size and mtime, so unchanged assets are not
+    hashed again.
+
+    Returns a SyncResult.
+    """
+    previous = load_manifest(manifest_path) if manifest_path is not None else {}
+    known_hashes = previous.get("hashes", {})
+
+    jobs = []
+    for root, _, files in os.walk(src_dir):
+        for name in files:
+            src_path = os.path.join(root, name)
+            jobs.append((os.path.relpath(src_path, src_dir), src_path))
+
+    def sync_one(job):
+        rel_path, src_path = job
+        hashed = None
+        dest_rel_path = rel_path
+        if fingerprint and _is_asset(rel_path):
+            stat = os.stat(src_path)
+            hashed = [stat.st_mtime_ns, stat.st_size]
+            known = known_hashes.get(rel_path)
+            if known is not None and known[:2] == hashed:
+                hashed.append(known[2])
+            else:
+                hashed.append(hash_file(src_path))
+            dest_rel_path = fingerprint_name(rel_path, hashed[2])
+        dst_path = os.path.join(dest_dir, dest_rel_path)
+        if is_up_to_date(src_path, dst_path, use_hash):
+            size = None
+        else:
+            size = copy_file(src_path, dst_path, link)
+        return rel_path, dest_rel_path, hashed, size
+
+    synced = set()
+    hashes = {}
+    assets = {} if fingerprint else None
+    copied = skipped = removed = bytes_copied = 0
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        for rel_path, dest_rel_path, hashed, size in pool.map(sync_one, jobs):
+            synced.add(dest_rel_path)
+            if hashed is not None:
+                hashes[rel_path] = hashed
+                assets[_url(rel_path)] = _url(dest_rel_path)
+            if size is None:
+                skipped += 1
+            else:
+                copied += 1
+                bytes_copied += size
+
+    if fingerprint:
+        data = json.dumps(assets, indent=2, sort_keys=True).encode()
+        write_if_changed(os.path.join(dest_dir, ASSET_MANIFEST_NAME), data)
+        synced.add(ASSET_MANIFEST_NAME)
+
+    if manifest_path is None:
+        return SyncResult(copied, skipped, removed, bytes_copied, assets)
+
+    for rel_path in previous.get("files", []):
+        if rel_path in synced:
+            continue
+        dst_path = os.path.join(dest_dir, rel_path)
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+            removed += 1
+            logger.info(
+                f"Removed: {dst_path}", extra=event("file_removed", dest=dst_path)
+            )
+        remove_empty_parents(dst_path, dest_dir)
+
+    save_manifest(manifest_path, {"files": sorted(synced), "hashes": hashes})
+    return SyncResult(copied, skipped, removed, bytes_copied, assets)
+
+
+def fingerprint_name(rel_path, digest) -> str:
+    """Return rel_path with the start of digest before its extension."""
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def _is_asset(rel_path) -> bool:
+    return os.path.splitext(rel_path)[1].lower() in FINGERPRINT_EXTENSIONS
+
+
+def _url(rel_path) -> str:
+    return "/" + rel_path.replace(os.sep, "/")
+
+
+def copy_file(src_path, dst_path, link=False) -> int:
+    """
+    Copy one file, creating its directory, and return the number of bytes
+    written. With link the file is hard-linked instead when src and dst are
+    on the same filesystem, which writes nothing.
+    """
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    # Build the new file beside dst_path and move it into place, so that
+    # dst_path is never half written and, if it is a hard link to a
+    # source, the source is never written through it.
+    tmp_path = temp_path(dst_path)
+
+    if link:
+        try:
+            os.link(src_path, tmp_path)
+        except OSError:
+            pass  # e.g. another filesystem; copy instead
+        else:
+            os.replace(tmp_path, dst_path)
+            if os.path.lexists(tmp_path):
+                # dst_path was already this very file, so rename did nothing
+                os.remove(tmp_path)
+            logger.debug(
+                "Linked: %s -> %s",
+                src_path,
+                dst_path,
+                extra=event("file_linked", source=src_path, dest=dst_path),
+            )
+            return 0
+
+    size = _copy_data(src_path, tmp_path)
+    # Keep the source mtime (but not its permission bits), which is what
+    # the next sync compares
+    stat = os.stat(src_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp_path, dst_path)
+    logger.debug(
+        "Copied: %s -> %s",
+        src_path,
+        dst_path,
+        extra=event("file_copied", source=src_path, dest=dst_path, bytes=size),
+    )
+    return size
+
+
+def _copy_data(src_path, dst_path) -> int:
+    """
+    Copy file contents with copy_file_range, which lets the kernel copy (or
+    reflink) without passing the data through Python, falling back to a
+    streaming copy where it is unavailable.
+    """
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(src.fileno(), dst.fileno(), COPY_CHUNK):
+                    pass
+                return os.fstat(dst.fileno()).st_size
+            except OSError:
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+        return os.fstat(dst.fileno()).st_size
+
+
+def is_up_to_date(src_path, dst_path, use_hash=False) -> bool:
+    try:
+        dst_stat = os.stat(dst_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dst_stat.st_size:
+        return False
+    if use_hash:
+        return hash_file(src_path) == hash_file(dst_path)
+    return src_stat.st_mtime_ns == dst_stat.st_mtime_ns
@@ -0,0 +1,162 @@
+import json
+import os
+import re
+from build_manifest import hash_bytes
+from conversions import with_basepath
+from html_minifier import minify_html
+
+INCLUDE_PATTERN = re.compile(r"\{\{ Include ([^\s}]+) \}\}")
+PLACEHOLDER_PATTERN = re.compile(r"(\{\{ Title \}\}|\{\{ Content \}\})")
+PLACEHOLDERS = {"{{ Title }}": "title", "{{ Content }}": "content"}
+ROOT_URL_PATTERN = re.compile(r'((?:href|src)=")(/[^"]*)')
+
+
+def rewrite_root_urls(html: str, basepath: str, assets: dict | None = None) -> str:
+    """
+    Point root-relative href and src attributes at basepath, and at the
+    fingerprinted name of any asset in assets (see with_basepath).
+    """
+    if basepath == "/" and not assets:
+        return html
+    return ROOT_URL_PATTERN.sub(
+        lambda match: match.group(1) + with_basepath(match.group(2), basepath, assets),
+        html,
+    )
+
+
+def asset_digest(assets: dict | None, images: dict | None = None) -> str:
+    """A short, stable digest of an asset map and image map ("" for none)."""
+    if not assets and not images:
+        return ""
+    data = [assets or {}, images] if images else assets
+    return hash_bytes(json.dumps(data, sort_keys=True).encode())[:16]
+
+
+def expand_includes(path: str, dependencies: list[str], stack: tuple) -> str:
+    """
+    Return the text of path with every {{ Include ... }} replaced by the
+    partial's own expanded text, adding each partial to dependencies.
+    """
+    if os.path.abspath(path) in stack:
+        chain = " -> ".join(list(stack) + [os.path.abspath(path)])
+        raise ValueError(f"Template include cycle: {chain}")
+    stack = stack + (os.path.abspath(path),)
+    with open(path, "r") as f:
+        text = f.read()
+
+    def include(match):
+        partial = os.path.normpath(
+            os.path.join(os.path.dirname(path), match.group(1))
+        )
+        if partial not in dependencies:
+            dependencies.append(partial)
+        return expand_includes(partial, dependencies, stack)
+
+    return INCLUDE_PATTERN.sub(include, text)
+
+
+class Template:
+    """
+    A page template compiled for one build.
+
+    The template text is split once into literal segments and placeholder
+    slots, and the basepath rewrite is applied to the literals up front.
+    Rendering a page is then a single join over the segments, and the page
+    content itself is never scanned again.
+
+    Templates loaded from a file may pull in partials with
+    {{ Include path }}, where path is relative to the including file.
+    Partials are inlined when the template is loaded and may include
+    further partials.
+
+    With minify, the whitespace and comments that do not render are
+    stripped from the template text before it is split (see minify_html),
+    so every page gets them for free. The page content is left as it is.
+
+    With assets, a map of root-relative URLs to fingerprinted ones, asset
+    URLs in the template are rewritten along with the basepath, and the
+    page content is rendered with the same map. Likewise images (see
+    build_image_variants) is used for the images in the page content.
+
+    Attributes:
+        path (str | None): Where the template was loaded from, if anywhere.
+        basepath (str): The URL prefix the literals were rewritten for.
+        minify (bool): Whether the literals were minified.
+        assets (dict): The fingerprinted asset URLs in use.
+        images (dict): The image sizes and variants in use.
+        asset_digest (str): asset_digest(assets, images), for cache keys.
+        dependencies (list[str]): The template file and every partial it
+            includes, directly or not, for incremental builds.
+
+    Example:
+        template = Template('<a href="/">{{ Title }}</a>', basepath="/ssg/")
+        template.render("Home", "")  # '<a href="/ssg/">Home</a>'
+    """
+
+    def __init__(
+        self,
+        text: str,
+        basepath: str = "/",
+        path: str | None = None,
+        dependencies: list[str] | None = None,
+        minify: bool = False,
+        assets: dict | None = None,
+        images: dict | None = None,
+    ) -> None:
+        self.path = path
+        self.basepath = basepath
+        self.minify = minify
+        self.assets = assets or {}
+        self.images = images or {}
+        self.asset_digest = asset_digest(assets, images)
+        if dependencies is None:
+            dependencies = [path] if path else []
+        self.dependencies = dependencies
+        if minify:
+            text = minify_html(text)
+        self.segments = []
+        self.slots = []
+        for i, part in enumerate(PLACEHOLDER_PATTERN.split(text)):
+            if i % 2 == 0:
+                self.segments.append(rewrite_root_urls(part, basepath, self.assets))
+            else:
+                self.slots.append((len(self.segments), PLACEHOLDERS[part]))
+                self.segments.append("")
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        basepath: str = "/",
+        minify: bool = False,
+        assets: dict | None = None,
+        images: dict | None = None,
+    ) -> "Template":
+        dependencies = [path]
+        text = expand_includes(path, dependencies, ())
+        return cls(text, basepath, path, dependencies, minify, assets, images)
+
+    def render(self, title: str, content: str) -> str:
+        values = {"title": title, "content": content}
+        parts = list(self.segments)
+        for index, name in self.slots:
+            parts[index] = values[name]
+        return "".join(parts)
+
+    def render_into(self, write, title: str, content) -> None:
+        """
+        Like render(), but pass the page to write fragment by fragment.
+        content may also be an HTMLNode, which is rendered straight into
+        write without building its HTML string first.
+        """
+        slots = dict(self.slots)
+        for index, segment in enumerate(self.segments):
+            name = slots.get(index)
+            if name is None:
+                write(segment)
+            elif name == "title":
+                write(title)
+            elif isinstance(content, str):
+                write(content)
+            else:
+                content.render_into(write)
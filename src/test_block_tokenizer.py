@@ -0,0 +1,98 @@
+import unittest
+from block_parser import markdown_to_blocks
+from block_tokenizer import Block, split_lines, tokenize_blocks
+from block_type import BlockType, block_to_block_type
+
+
+class TestTokenizeBlocks(unittest.TestCase):
+    def test_typed_blocks_with_lines(self):
+        md = """
+# Title
+
+Some **bold**
+text here
+
+- one
+- two
+
+1. first
+2. second
+
+> quoted
+> more
+"""
+        self.assertEqual(
+            list(tokenize_blocks(md)),
+            [
+                Block(BlockType.HEADING, ["# Title"]),
+                Block(BlockType.PARAGRAPH, ["Some **bold**", "text here"]),
+                Block(BlockType.UNORDERED_LIST, ["- one", "- two"]),
+                Block(BlockType.ORDERED_LIST, ["1. first", "2. second"]),
+                Block(BlockType.QUOTE, ["> quoted", "> more"]),
+            ],
+        )
+
+    def test_code_block_keeps_blank_lines(self):
+        md = "```\nfirst\n\nsecond\n```\n\nafter"
+        self.assertEqual(
+            list(tokenize_blocks(md)),
+            [
+                Block(BlockType.CODE, ["first", "", "second"]),
+                Block(BlockType.PARAGRAPH, ["after"]),
+            ],
+        )
+
+    def test_single_line_code_block(self):
+        self.assertEqual(
+            list(tokenize_blocks("```print('hi')```")), [Block(BlockType.CODE, [])]
+        )
+
+    def test_unclosed_code_block_runs_to_end(self):
+        md = "```\ncode\n\nmore"
+        self.assertEqual(
+            list(tokenize_blocks(md)), [Block(BlockType.CODE, ["code", "", "more"])]
+        )
+
+    def test_matches_block_parser(self):
+        md = """
+  # Heading  
+
+Paragraph with _italic_
+   continued
+
+```
+code
+```
+
+- a
+- b
+
+3. not
+4. ordered
+"""
+        expected = [
+            (block_to_block_type(block), block.splitlines())
+            for block in markdown_to_blocks(md)
+        ]
+        actual = [
+            (block.block_type, block.lines)
+            for block in tokenize_blocks(md)
+            if block.block_type != BlockType.CODE
+        ]
+        self.assertEqual(actual, [e for e in expected if e[0] != BlockType.CODE])
+
+    def test_empty_document(self):
+        self.assertEqual(list(tokenize_blocks("")), [])
+        self.assertEqual(list(tokenize_blocks("\n \n\n")), [])
+
+    def test_lines_end_only_at_newlines(self):
+        self.assertEqual(split_lines("a\r\nb\rc\nd"), ["a", "b", "c", "d"])
+        self.assertEqual(split_lines("- a\u2028- b\x0c"), ["- a\u2028- b\x0c"])
+        self.assertEqual(
+            list(tokenize_blocks("- a\u2028- b")),
+            [Block(BlockType.UNORDERED_LIST, ["- a\u2028- b"])],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
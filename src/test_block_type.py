@@ -28,6 +28,17 @@ class TestBlockType(unittest.TestCase):
         md = "1. First\n3. Skipped\n4. Bad"
         self.assertNotEqual(block_to_block_type(md), BlockType.ORDERED_LIST)
 
+    def test_long_ordered_list(self):
+        md = "\n".join(f"{i}. item" for i in range(1, 301))
+        self.assertEqual(block_to_block_type(md), BlockType.ORDERED_LIST)
+        md = md.replace("150. item", "105. item")
+        self.assertEqual(block_to_block_type(md), BlockType.PARAGRAPH)
+
+    def test_ordered_list_needs_space_after_number(self):
+        self.assertEqual(block_to_block_type("1.First"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. a\n2.b"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("1. a\n12. b"), BlockType.PARAGRAPH)
+
     def test_paragraph_default(self):
         self.assertEqual(
             block_to_block_type("Just some normal paragraph text."), BlockType.PARAGRAPH
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from build_log import configure_logging, event, format_bytes, logger
+from page_generator import generate_pages_recursive
+
+
+class TestBuildLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.events = os.path.join(self.tmp.name, "events.jsonl")
+        self.addCleanup(configure_logging, "quiet")
+
+    def read_events(self):
+        with open(self.events) as f:
+            return [json.loads(line) for line in f]
+
+    def test_events_are_written_as_json_lines(self):
+        configure_logging("quiet", self.events)
+        logger.debug("Copied: a", extra=event("file_copied", source="a", bytes=3))
+        logger.info("done")
+        self.assertEqual(
+            [
+                (e["level"], e["event"], e["message"], e.get("bytes"))
+                for e in self.read_events()
+            ],
+            [
+                ("debug", "file_copied", "Copied: a", 3),
+                ("info", "message", "done", None),
+            ],
+        )
+
+    def test_verbosity_sets_the_console_level(self):
+        for verbosity, level in [
+            ("quiet", logging.WARNING),
+            ("normal", logging.INFO),
+            ("verbose", logging.DEBUG),
+        ]:
+            configure_logging(verbosity)
+            self.assertEqual(len(logger.handlers), 1)
+            self.assertEqual(logger.handlers[0].level, level)
+            self.assertEqual(logger.level, level)
+
+    def test_events_file_is_restarted_unless_appending(self):
+        configure_logging("quiet", self.events)
+        logger.info("first")
+        configure_logging("quiet", self.events)
+        logger.info("second")
+        configure_logging("quiet", self.events, append=True)
+        logger.info("third")
+        messages = [e["message"] for e in self.read_events()]
+        self.assertEqual(messages, ["second", "third"])
+
+    def test_parallel_build_writes_whole_lines(self):
+        content = os.path.join(self.tmp.name, "content")
+        template = os.path.join(self.tmp.name, "template.html")
+        with open(template, "w") as f:
+            f.write("{{ Title }}{{ Content }}")
+        for i in range(8):
+            os.makedirs(os.path.join(content, str(i)))
+            with open(os.path.join(content, str(i), "index.md"), "w") as f:
+                f.write(f"# Page {i}")
+        configure_logging("quiet", self.events)
+        logger.info("build started")
+        dest = os.path.join(self.tmp.name, "docs")
+        generate_pages_recursive(content, template, dest, "/", jobs=2)
+        logger.info("build finished")
+        events = self.read_events()
+        rendered = [e for e in events if e["event"] == "page_rendered"]
+        self.assertEqual(len(rendered), 8)
+        self.assertEqual(events[0]["message"], "build started")
+        self.assertEqual(events[-1]["message"], "build finished")
+
+    def test_format_bytes(self):
+        self.assertEqual(format_bytes(512), "512 B")
+        self.assertEqual(format_bytes(1744), "1.7 kB")
+        self.assertEqual(format_bytes(3_100_000), "3.1 MB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import os
+import tempfile
+import unittest
+from build_manifest import load_manifest, save_manifest
+
+
+class TestBuildManifest(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nested", "manifest.json")
+            save_manifest(path, {"pages": {"a.md": {"hash": "x"}}})
+            self.assertEqual(load_manifest(path)["pages"], {"a.md": {"hash": "x"}})
+
+    def test_missing_manifest_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(load_manifest(os.path.join(tmp, "nope.json")), {})
+
+    def test_corrupt_manifest_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            with open(path, "w") as f:
+                f.write("{not json")
+            self.assertEqual(load_manifest(path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
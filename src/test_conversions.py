@@ -1,5 +1,5 @@
 import unittest
-from conversions import text_node_to_html_node
+from conversions import image_props, text_node_to_html_node, with_basepath
 import htmlnode
 from textnode import TextNode, TextType
 
@@ -78,5 +78,39 @@ class TestConversions(unittest.TestCase):
         )
 
 
+    def test_with_basepath_maps_fingerprinted_assets(self):
+        assets = {"/a.png": "/a.0123456789.png"}
+        self.assertEqual(
+            with_basepath("/a.png", "/ssg/", assets), "/ssg/a.0123456789.png"
+        )
+        self.assertEqual(with_basepath("/a.png", "/", assets), "/a.0123456789.png")
+        self.assertEqual(with_basepath("/b.png", "/ssg/", assets), "/ssg/b.png")
+
+    def test_image_with_variants(self):
+        node = TextNode("pic", TextType.IMAGE, "/a.png")
+        images = {
+            "/a.png": {
+                "width": 960,
+                "height": 480,
+                "variants": [["/a.0123456789.480w.webp", 480]],
+            }
+        }
+        html_node = text_node_to_html_node(node, "/ssg/", images=images)
+        self.assertEqual(
+            html_node.to_html(),
+            '<img src="/ssg/a.png" alt="pic"'
+            ' srcset="/ssg/a.0123456789.480w.webp 480w, /ssg/a.png 960w"'
+            ' sizes="(max-width: 960px) 100vw, 960px" width="960" height="480"'
+            ' loading="lazy">pic</img>',
+        )
+
+    def test_image_props_without_variants(self):
+        info = {"width": 20, "height": 10, "variants": []}
+        self.assertEqual(
+            image_props(info, "/a.png"),
+            {"width": "20", "height": "10", "loading": "lazy"},
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
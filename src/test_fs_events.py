@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from fs_events import tree_events
+
+
+class TestTreeEvents(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "content")
+        os.makedirs(os.path.join(self.root, "blog"))
+        self.events = tree_events([self.root])
+        if self.events is None:
+            self.skipTest("inotify is not available")
+        self.addCleanup(self.events.close)
+
+    def write(self, path, text="x"):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_reports_written_files(self):
+        path = os.path.join(self.root, "blog", "index.md")
+        self.write(path)
+        self.assertEqual(self.events.read(), {path})
+        self.assertEqual(self.events.read(), set())
+
+    def test_watches_new_directories(self):
+        new_dir = os.path.join(self.root, "a")
+        os.mkdir(new_dir)
+        self.assertEqual(self.events.read(), {new_dir})
+        path = os.path.join(new_dir, "index.md")
+        self.write(path)
+        self.assertEqual(self.events.read(), {path})
+
+    def test_moved_directory_reports_under_new_name(self):
+        old_dir = os.path.join(self.root, "blog")
+        new_dir = os.path.join(self.root, "news")
+        os.rename(old_dir, new_dir)
+        self.assertEqual(self.events.read(), {old_dir, new_dir})
+        path = os.path.join(new_dir, "index.md")
+        self.write(path)
+        self.assertEqual(self.events.read(), {path})
+
+
+if __name__ == "__main__":
+    unittest.main()
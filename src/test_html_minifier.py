@@ -0,0 +1,52 @@
+import unittest
+from html_minifier import minify_html
+
+
+class TestMinifyHTML(unittest.TestCase):
+    def test_drops_whitespace_between_block_tags(self):
+        html = "<!doctype html>\n<html>\n\n<head>\n  <title>T</title>\n</head>\n</html>\n"
+        self.assertEqual(
+            minify_html(html),
+            "<!doctype html><html><head><title>T</title></head></html>",
+        )
+
+    def test_collapses_whitespace_between_inline_elements(self):
+        self.assertEqual(
+            minify_html("<p>one\n   <em>two</em>   <b>three</b>  </p>"),
+            "<p>one <em>two</em> <b>three</b></p>",
+        )
+
+    def test_keeps_raw_elements_as_written(self):
+        html = (
+            "<pre>\n  a  b\n</pre>\n<textarea> x </textarea>\n"
+            "<script>if (a < b) {\n  go();\n}</script>\n<style>p  { }</style>"
+        )
+        self.assertEqual(minify_html(html), html.replace(">\n<", "><"))
+
+    def test_code_inside_pre_is_kept(self):
+        html = "<div>\n  <pre><code>x  = 1\n\n  y</code></pre>\n</div>"
+        self.assertEqual(
+            minify_html(html), "<div><pre><code>x  = 1\n\n  y</code></pre></div>"
+        )
+
+    def test_removes_comments_but_not_conditional_comments(self):
+        self.assertEqual(
+            minify_html("<div><!-- note --></div><!--[if IE]><p>old</p><![endif]-->"),
+            "<div></div><!--[if IE]><p>old</p><![endif]-->",
+        )
+
+    def test_space_around_removed_comment_is_collapsed(self):
+        self.assertEqual(minify_html("a <!-- x --> b"), "a b")
+
+    def test_less_than_in_text_is_not_a_tag(self):
+        self.assertEqual(minify_html("<p>a  < b</p>"), "<p>a < b</p>")
+
+    def test_tags_and_placeholders_are_untouched(self):
+        html = '<a title="a > b"   href="/">  {{ Title }}  </a>'
+        self.assertEqual(
+            minify_html(html), '<a title="a > b"   href="/"> {{ Title }} </a>'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from unittest import mock
+import image_variants
+from image_variants import build_image_variants, image_size, variant_name
+
+
+def png_bytes(width, height) -> bytes:
+    def chunk(kind, data):
+        crc = zlib.crc32(kind + data)
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    rows = b"".join(b"\x00" + b"\x80\x40\x20" * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def exif_segment(orientation) -> bytes:
+    # Big-endian TIFF header, then one IFD holding just the orientation
+    exif = (
+        b"Exif\x00\x00MM\x00\x2a"
+        + struct.pack(">IH", 8, 1)
+        + struct.pack(">HHIHH", 0x0112, 3, 1, orientation, 0)
+        + struct.pack(">I", 0)
+    )
+    return b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif
+
+
+class TestImageSize(unittest.TestCase):
+    def size_of(self, data):
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            return image_size(f.name)
+
+    def test_png(self):
+        self.assertEqual(self.size_of(png_bytes(3, 2)), (3, 2))
+
+    def test_gif(self):
+        gif = b"GIF89a" + struct.pack("<HH", 640, 480)
+        self.assertEqual(self.size_of(gif), (640, 480))
+
+    def test_jpeg(self):
+        app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+        sof0 = b"\xff\xc0" + struct.pack(">HBHH", 11, 8, 300, 400) + b"\x01" * 6
+        self.assertEqual(self.size_of(b"\xff\xd8" + app0 + sof0), (400, 300))
+
+    def test_jpeg_turned_by_exif_orientation(self):
+        sof0 = b"\xff\xc0" + struct.pack(">HBHH", 11, 8, 300, 400) + b"\x01" * 6
+        for orientation, size in ((6, (300, 400)), (3, (400, 300))):
+            jpeg = b"\xff\xd8" + exif_segment(orientation) + sof0
+            self.assertEqual(self.size_of(jpeg), size)
+
+    def test_webp(self):
+        vp8x = (
+            b"RIFF\x00\x00\x00\x00WEBPVP8X"
+            + struct.pack("<I", 10)
+            + b"\x00" * 4
+            + (799).to_bytes(3, "little")
+            + (599).to_bytes(3, "little")
+        )
+        self.assertEqual(self.size_of(vp8x), (800, 600))
+
+    def test_truncated_headers(self):
+        self.assertIsNone(self.size_of(png_bytes(3, 2)[:20]))
+        self.assertIsNone(self.size_of(b"\xff\xd8\xff\xe0\x00"))
+
+    def test_unknown_format(self):
+        self.assertIsNone(self.size_of(b"not an image at all"))
+
+
+class TestBuildImageVariants(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.cache = os.path.join(self.tmp.name, "cache", "images")
+        self.manifest = os.path.join(self.tmp.name, "cache", "images.json")
+        os.makedirs(os.path.join(self.src, "images"))
+        self.image = os.path.join(self.src, "images", "a.png")
+        with open(self.image, "wb") as f:
+            f.write(png_bytes(40, 20))
+        with open(os.path.join(self.src, "index.css"), "w") as f:
+            f.write("body {}")
+
+    def build(self):
+        return build_image_variants(
+            self.src, self.dest, self.cache, self.manifest, widths=(10, 20, 80)
+        )
+
+    def test_without_pillow_images_only_get_their_size(self):
+        with mock.patch.object(image_variants, "Image", None):
+            with self.assertLogs("ssg", "WARNING"):
+                result = self.build()
+        self.assertEqual(
+            result.images,
+            {"/images/a.png": {"width": 40, "height": 20, "variants": []}},
+        )
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_gifs_get_their_size_but_no_variants(self):
+        with open(os.path.join(self.src, "images", "b.gif"), "wb") as f:
+            f.write(b"GIF89a" + struct.pack("<HH", 64, 32))
+        if image_variants.Image is None:
+            with self.assertLogs("ssg", "WARNING"):
+                result = self.build()
+        else:
+            result = self.build()
+        # Even with Pillow, where a.png gets variants
+        self.assertEqual(
+            result.images["/images/b.gif"],
+            {"width": 64, "height": 32, "variants": []},
+        )
+
+    @unittest.skipIf(image_variants.Image is None, "needs Pillow")
+    def test_writes_variants_narrower_than_the_image(self):
+        result = self.build()
+        self.assertEqual(result.generated, 2)
+        variants = result.images["/images/a.png"]["variants"]
+        self.assertEqual([width for _, width in variants], [10, 20])
+        smallest = os.path.join(self.dest, variants[0][0][1:])
+        with image_variants.Image.open(smallest) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (10, 5)))
+
+    @unittest.skipIf(image_variants.Image is None, "needs Pillow")
+    def test_variants_are_turned_upright(self):
+        photo = image_variants.Image.new("RGB", (40, 20))
+        exif = image_variants.Image.Exif()
+        exif[0x0112] = 6
+        photo.save(os.path.join(self.src, "images", "b.jpg"), exif=exif)
+        result = self.build()
+        described = result.images["/images/b.jpg"]
+        self.assertEqual((described["width"], described["height"]), (20, 40))
+        self.assertEqual([width for _, width in described["variants"]], [10])
+        smallest = os.path.join(self.dest, described["variants"][0][0][1:])
+        with image_variants.Image.open(smallest) as image:
+            self.assertEqual(image.size, (10, 20))
+
+    @unittest.skipIf(image_variants.Image is None, "needs Pillow")
+    def test_variants_are_never_encoded_twice(self):
+        self.build()
+        self.assertEqual(self.build()[:3], (0, 2, 0))
+        # Even when the output is gone, the cache still has them
+        variants = self.build().images["/images/a.png"]["variants"]
+        for url, _ in variants:
+            os.remove(os.path.join(self.dest, url[1:]))
+        self.assertEqual(self.build()[:2], (0, 2))
+        for url, _ in variants:
+            self.assertTrue(os.path.exists(os.path.join(self.dest, url[1:])))
+
+    @unittest.skipIf(image_variants.Image is None, "needs Pillow")
+    def test_variants_of_removed_images_are_removed(self):
+        self.build()
+        os.remove(self.image)
+        result = self.build()
+        self.assertEqual((result.removed, result.images), (2, {}))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+
+    def test_variant_name(self):
+        self.assertEqual(
+            variant_name(os.path.join("img", "a.png"), "0123456789abcdef", 480),
+            os.path.join("img", "a.0123456789.480w.webp"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
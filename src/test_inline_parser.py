@@ -331,6 +331,40 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(text_to_textnodes(text), expected)
 
+    def test_code_span_protects_emphasis(self):
+        text = "Use `a*b*c` and `__init__` here"
+        expected = [
+            TextNode("Use ", TextType.TEXT),
+            TextNode("a*b*c", TextType.CODE),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("__init__", TextType.CODE),
+            TextNode(" here", TextType.TEXT),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_unclosed_delimiter_raises(self):
+        with self.assertRaises(Exception):
+            text_to_textnodes("This is **not closed")
+
+    def test_exclamation_and_brackets_without_markup(self):
+        text = "Wow! [not a link] and ![not an image]"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_matches_chained_split_passes(self):
+        text = (
+            "Start **bold** then _it_ and *it2* with `code`, a [link](https://a.b/c_d)"
+            " and ![img](/i.png) ending with **more bold** text."
+        )
+        nodes = [TextNode(text, TextType.TEXT)]
+        nodes = split_nodes_image(nodes)
+        nodes = split_nodes_link(nodes)
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        expected = [n for n in nodes if not (n.text == "" and n.text_type == TextType.TEXT)]
+        self.assertEqual(text_to_textnodes(text), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
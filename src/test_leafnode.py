@@ -50,6 +50,19 @@ class TestLeafNode(unittest.TestCase):
         expected = "HTMLNode(tag='span', value='Hello', props={'class': 'highlight'})"
         self.assertEqual(result, expected)
 
+    def test_leaf_nodes_are_slotted_and_share_empty_defaults(self):
+        # Given: Two LeafNodes created without props
+        first = LeafNode("p", "one")
+        second = LeafNode(None, "two")
+        # Then: They have no per-instance __dict__ and share the empty defaults
+        self.assertFalse(hasattr(first, "__dict__"))
+        self.assertIs(first.children, second.children)
+        self.assertIs(first.props, second.props)
+        self.assertEqual(first.props, {})
+        # And: The shared props cannot be mutated by accident
+        with self.assertRaises(TypeError):
+            first.props["class"] = "x"
+
 
 if __name__ == "__main__":
     unittest.main()
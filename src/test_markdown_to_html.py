@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from markdown_to_html import markdown_to_html_node
+from markdown_to_html import MarkdownFile, markdown_to_html_node, text_to_children
 
 
 class TestMarkdownToHtmlNode(unittest.TestCase):
@@ -27,6 +29,14 @@ the **same** even with inline stuff
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
         )
 
+    def test_code_block_with_blank_lines(self):
+        md = "```\nfirst\n\nsecond\n```\n\nafter"
+        node = markdown_to_html_node(md)
+        self.assertEqual(
+            node.to_html(),
+            "<div><pre><code>first\n\nsecond\n</code></pre><p>after</p></div>",
+        )
+
     def test_heading_levels(self):
         md = "# Heading 1\n## Heading 2\n### Heading 3"
         node = markdown_to_html_node(md)
@@ -65,6 +75,67 @@ the **same** even with inline stuff
             "<div><ol><li>First item</li><li>Second item with <code>code</code></li><li>Third item</li></ol></div>",
         )
 
+    def test_basepath_prefixes_root_relative_urls(self):
+        md = "[Home](/) and [ext](https://example.com) ![pic](/images/a.png)"
+        node = markdown_to_html_node(md, basepath="/ssg/")
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><a href="/ssg/">Home</a> and <a href="https://example.com">ext</a> <img src="/ssg/images/a.png" alt="pic">pic</img></p></div>',
+        )
+
+    def test_fingerprinted_image_urls(self):
+        md = "- ![pic](/images/a.png)"
+        assets = {"/images/a.png": "/images/a.0123456789.png"}
+        node = markdown_to_html_node(md, basepath="/ssg/", assets=assets)
+        self.assertEqual(
+            node.to_html(),
+            '<div><ul><li><img src="/ssg/images/a.0123456789.png" alt="pic">pic</img>'
+            "</li></ul></div>",
+        )
+
+
+
+class TestTextToChildren(unittest.TestCase):
+    def test_plain_text_is_one_raw_leaf(self):
+        children = text_to_children("Just words, (and) punctuation.")
+        self.assertEqual(len(children), 1)
+        self.assertIsNone(children[0].tag)
+        self.assertEqual(children[0].value, "Just words, (and) punctuation.")
+
+    def test_empty_text_has_no_children(self):
+        self.assertEqual(text_to_children(""), [])
+
+    def test_markup_still_goes_through_the_parser(self):
+        children = text_to_children("plain and **bold**")
+        self.assertEqual(
+            [child.to_html() for child in children], ["plain and ", "<b>bold</b>"]
+        )
+
+
+
+class TestMarkdownFile(unittest.TestCase):
+    def test_matches_markdown_to_html_node_and_keeps_summary(self):
+        md = "# Title\n\n```\ncode\n```\n\nFirst **para**.\n\nSecond."
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.md")
+            with open(path, "w") as f:
+                f.write(md)
+            content = MarkdownFile(path, "/ssg/")
+            parts = []
+            content.render_into(parts.append)
+        self.assertEqual("".join(parts), markdown_to_html_node(md, "/ssg/").to_html())
+        self.assertEqual(content.summary, "First para.")
+
+    def test_splits_lines_like_markdown_to_html_node(self):
+        for md in ("- a\u2028- b", "- a\x0c\n- b\x1c\n\n1. c\x85", "- a\r\n- b\r- c"):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "index.md")
+                with open(path, "w", newline="") as f:
+                    f.write(md)
+                parts = []
+                MarkdownFile(path).render_into(parts.append)
+            self.assertEqual("".join(parts), markdown_to_html_node(md).to_html())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from output_writer import OutputFile, write_if_changed
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "out", "index.html")
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def age(self):
+        # Push the mtime into the past so a rewrite would be visible
+        os.utime(self.path, ns=(0, 0))
+
+    def test_write_if_changed(self):
+        self.assertTrue(write_if_changed(self.path, b"<p>a</p>"))
+        self.age()
+        self.assertFalse(write_if_changed(self.path, b"<p>a</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        # Same size, different bytes
+        self.assertTrue(write_if_changed(self.path, b"<p>b</p>"))
+        self.assertEqual(self.read(), b"<p>b</p>")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+    def test_output_file_skips_identical_content(self):
+        with OutputFile(self.path) as out:
+            out.write("<p>")
+            out.write("a</p>")
+        self.assertTrue(out.changed)
+        self.assertEqual(out.size, 8)
+        self.age()
+
+        with OutputFile(self.path) as out:
+            out.write("<p>a</p>")
+        self.assertFalse(out.changed)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+    def test_output_file_keeps_the_old_file_on_error(self):
+        write_if_changed(self.path, b"old")
+        with self.assertRaises(RuntimeError):
+            with OutputFile(self.path) as out:
+                out.write("half a pa")
+                raise RuntimeError("render failed")
+        self.assertEqual(self.read(), b"old")
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
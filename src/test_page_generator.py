@@ -1,5 +1,15 @@
+import json
+import os
+import tempfile
 import unittest
-from page_generator import extract_title
+from unittest import mock
+import page_generator
+from page_generator import (
+    PageBuildResult,
+    extract_title,
+    generate_pages_recursive,
+)
+from render_cache import RenderCache
 
 
 class TestExtractTitle(unittest.TestCase):
@@ -17,5 +27,304 @@ class TestExtractTitle(unittest.TestCase):
             extract_title(md)
 
 
+class TestGeneratePagesRecursive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.dest = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.manifest = os.path.join(root, "cache", "pages.json")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def build(self, basepath="/", minify=False, assets=None):
+        return generate_pages_recursive(
+            self.content,
+            self.template,
+            self.dest,
+            basepath,
+            self.manifest,
+            minify=minify,
+            assets=assets,
+        )
+
+    def test_unchanged_pages_are_skipped(self):
+        self.build()
+        home = os.path.join(self.dest, "index.html")
+        # Overwrite the output; an up-to-date page must not be regenerated.
+        self.write(home, "untouched")
+        self.build()
+        self.assertEqual(self.read(home), "untouched")
+
+    def test_changed_source_is_rebuilt(self):
+        self.build()
+        blog = os.path.join(self.dest, "blog", "index.html")
+        home = os.path.join(self.dest, "index.html")
+        self.write(home, "untouched")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# News")
+        self.build()
+        self.assertEqual(self.read(blog), "<title>News</title><div><h1>News</h1></div>")
+        self.assertEqual(self.read(home), "untouched")
+
+    def test_template_change_rebuilds_everything(self):
+        self.build()
+        home = os.path.join(self.dest, "index.html")
+        self.write(home, "untouched")
+        self.write(self.template, "{{ Title }}")
+        self.build()
+        self.assertEqual(self.read(home), "Home")
+
+    def test_basepath_change_rebuilds_everything(self):
+        self.build()
+        home = os.path.join(self.dest, "index.html")
+        self.write(home, "untouched")
+        self.build("/ssg/")
+        self.assertNotEqual(self.read(home), "untouched")
+
+    def test_minify_change_rebuilds_everything(self):
+        self.write(self.template, "<title>{{ Title }}</title>\n  {{ Content }}")
+        self.write(
+            os.path.join(self.content, "index.md"), "# Home\n\n```\nkeep  this\n```"
+        )
+        self.build()
+        self.build(minify=True)
+        home = os.path.join(self.dest, "index.html")
+        self.assertEqual(
+            self.read(home),
+            "<title>Home</title><div><h1>Home</h1>"
+            "<pre><code>keep  this\n</code></pre></div>",
+        )
+
+    def test_asset_names_change_rebuilds_everything(self):
+        self.write(self.template, '<link href="/a.css">{{ Content }}')
+        self.build(assets={"/a.css": "/a.1111111111.css"})
+        home = os.path.join(self.dest, "index.html")
+        self.write(home, "untouched")
+        self.build(assets={"/a.css": "/a.1111111111.css"})
+        self.assertEqual(self.read(home), "untouched")
+        self.build(assets={"/a.css": "/a.2222222222.css"})
+        self.assertEqual(
+            self.read(home), '<link href="/a.2222222222.css"><div><h1>Home</h1></div>'
+        )
+
+    def test_parallel_build_matches_serial_build(self):
+        for i in range(6):
+            self.write(
+                os.path.join(self.content, "posts", str(i), "index.md"),
+                f"# Post {i}\n\nSome **bold** text and a [link](/posts/{i}).",
+            )
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        generate_pages_recursive(self.content, self.template, serial_dest, "/ssg/")
+        generate_pages_recursive(self.content, self.template, self.dest, "/ssg/", jobs=3)
+        for root, _, files in os.walk(serial_dest):
+            for name in files:
+                serial_path = os.path.join(root, name)
+                parallel_path = os.path.join(
+                    self.dest, os.path.relpath(serial_path, serial_dest)
+                )
+                self.assertEqual(self.read(parallel_path), self.read(serial_path))
+
+    def test_threaded_io_matches_serial_build(self):
+        for i in range(10):
+            page = os.path.join(self.content, f"p{i}", "index.md")
+            self.write(page, f"# P{i}\n\nx")
+        serial_dest = os.path.join(self.tmp.name, "serial")
+        generate_pages_recursive(self.content, self.template, serial_dest, "/")
+        result = generate_pages_recursive(
+            self.content, self.template, self.dest, "/", io_threads=3
+        )
+        self.assertEqual(result.rendered, 12)
+        for i in range(10):
+            rel = os.path.join(f"p{i}", "index.html")
+            self.assertEqual(
+                self.read(os.path.join(self.dest, rel)),
+                self.read(os.path.join(serial_dest, rel)),
+            )
+
+    def test_errors_name_the_source_file(self):
+        broken = os.path.join(self.content, "broken", "index.md")
+        self.write(broken, "No title here")
+        for jobs, io_threads in ((1, 0), (2, 0), (1, 2)):
+            with self.assertRaises(Exception) as cm:
+                generate_pages_recursive(
+                    self.content,
+                    self.template,
+                    self.dest,
+                    "/",
+                    jobs=jobs,
+                    io_threads=io_threads,
+                )
+            self.assertIn(broken, str(cm.exception))
+
+    def test_template_change_reuses_cached_content(self):
+        cache = RenderCache(os.path.join(self.tmp.name, "render"))
+        generate_pages_recursive(
+            self.content, self.template, self.dest, "/", self.manifest, cache=cache
+        )
+        self.write(self.template, "[{{ Title }}]{{ Content }}")
+        with mock.patch(
+            "page_generator.markdown_to_html_node", side_effect=AssertionError
+        ):
+            generate_pages_recursive(
+                self.content, self.template, self.dest, "/", self.manifest, cache=cache
+            )
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "index.html")),
+            "[Home]<div><h1>Home</h1></div>",
+        )
+
+    def test_deleted_source_removes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_large_sources_are_streamed_with_the_same_output(self):
+        md = (
+            "# Big\n\nSome **prose** with a [link](/blog/).\n\n"
+            "```\ncode\n\nmore code\n```\n\n- one\n- two\n\n1. a\n2. b\n"
+        )
+        self.write(os.path.join(self.content, "big", "index.md"), md)
+        self.build("/ssg/")
+        expected = self.read(os.path.join(self.dest, "big", "index.html"))
+
+        streamed_dest = os.path.join(self.tmp.name, "streamed")
+        with mock.patch.object(page_generator, "STREAM_THRESHOLD", 0):
+            generate_pages_recursive(
+                self.content, self.template, streamed_dest, "/ssg/"
+            )
+        self.assertEqual(
+            self.read(os.path.join(streamed_dest, "big", "index.html")), expected
+        )
+
+    def test_directory_templates_apply_below_their_directory(self):
+        blog_template = os.path.join(self.content, "blog", "template.html")
+        self.write(blog_template, "B:{{ Title }}")
+        self.write(os.path.join(self.content, "blog", "post", "index.md"), "# Post")
+        self.build()
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "blog", "index.html")), "B:Blog"
+        )
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "blog", "post", "index.html")), "B:Post"
+        )
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "index.html")),
+            "<title>Home</title><div><h1>Home</h1></div>",
+        )
+
+    def test_partial_change_rebuilds_only_its_dependents(self):
+        footer = os.path.join(self.tmp.name, "footer.html")
+        self.write(footer, "v1")
+        blog_template = os.path.join(self.content, "blog", "template.html")
+        self.write(blog_template, "{{ Title }}|{{ Include ../../footer.html }}")
+        self.assertEqual(self.build().rendered, 2)
+
+        self.write(footer, "v2")
+        result = self.build()
+        self.assertEqual((result.rendered, result.skipped), (1, 1))
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "blog", "index.html")), "Blog|v2"
+        )
+
+    def test_site_index_covers_rendered_and_skipped_pages(self):
+        blog_md = os.path.join(self.content, "blog", "index.md")
+        self.write(blog_md, "# Blog\n\n## Latest\n\nNew _posts_ here.\n\nMore.")
+        index_path = os.path.join(self.dest, "pages.json")
+        indexes = []
+        for _ in range(2):
+            result = generate_pages_recursive(
+                self.content,
+                self.template,
+                self.dest,
+                "/ssg/",
+                self.manifest,
+                site_url="https://example.com",
+            )
+            indexes.append(self.read(index_path))
+        # The second build skipped both pages but wrote the same index
+        self.assertEqual(result.skipped, 2)
+        self.assertEqual(indexes[0], indexes[1])
+
+        pages = json.loads(indexes[1])["pages"]
+        self.assertEqual(
+            [(p["url"], p["title"], p["summary"]) for p in pages],
+            [("/ssg/", "Home", ""), ("/ssg/blog/", "Blog", "New posts here.")],
+        )
+        self.assertIn(
+            "<loc>https://example.com/ssg/blog/</loc>",
+            self.read(os.path.join(self.dest, "sitemap.xml")),
+        )
+        self.assertIn(
+            "<description>New posts here.</description>",
+            self.read(os.path.join(self.dest, "feed.xml")),
+        )
+
+    def test_site_index_is_removed_without_site_url(self):
+        for site_url in ("https://example.com", None):
+            generate_pages_recursive(
+                self.content,
+                self.template,
+                self.dest,
+                "/ssg/",
+                self.manifest,
+                site_url=site_url,
+            )
+        for name in ("pages.json", "sitemap.xml", "feed.xml"):
+            self.assertFalse(os.path.exists(os.path.join(self.dest, name)))
+
+    def test_changed_site_index_files_are_kept(self):
+        generate_pages_recursive(
+            self.content,
+            self.template,
+            self.dest,
+            "/ssg/",
+            self.manifest,
+            site_url="https://example.com",
+        )
+        sitemap = os.path.join(self.dest, "sitemap.xml")
+        self.write(sitemap, "<urlset>mine</urlset>")
+        with self.assertLogs("ssg", "INFO"):
+            self.build()
+        self.assertEqual(self.read(sitemap), "<urlset>mine</urlset>")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "feed.xml")))
+
+    def test_identical_output_is_not_rewritten(self):
+        self.build()
+        home = os.path.join(self.dest, "index.html")
+        os.utime(home, ns=(0, 0))
+        # A template edit that renders to the same pages: both are rebuilt
+        # but neither output is written again
+        self.write(os.path.join(self.tmp.name, "empty.html"), "")
+        self.write(
+            self.template,
+            "<title>{{ Title }}</title>{{ Content }}{{ Include empty.html }}",
+        )
+        result = self.build()
+        self.assertEqual((result.rendered, result.changed), (2, 0))
+        self.assertEqual(os.stat(home).st_mtime_ns, 0)
+
+    def test_reports_what_it_did(self):
+        first = self.build()
+        self.assertEqual((first.rendered, first.skipped, first.removed), (2, 0, 0))
+        self.assertEqual(first.changed, 2)
+        self.assertGreater(first.bytes_written, 0)
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.assertEqual(self.build(), PageBuildResult(0, 1, 1, 0))
+
+
 if __name__ == "__main__":
     unittest.main()
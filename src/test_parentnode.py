@@ -92,6 +92,56 @@ class TestParentNode(unittest.TestCase):
         # Then: It should render all nested levels properly
         self.assertEqual(result, "<section><div><span><b>deep</b></span></div></section>")
 
+    def test_render_into_list(self):
+        # Given: A ParentNode with nested children and props
+        node = ParentNode(
+            "ul",
+            [ParentNode("li", [LeafNode("b", "one")]), LeafNode("li", "two")],
+            {"class": "list"},
+        )
+
+        # When: Rendering into a list of fragments
+        parts = []
+        node.render_into(parts.append)
+
+        # Then: The fragments should join to the same HTML as to_html()
+        self.assertGreater(len(parts), 1)
+        self.assertEqual("".join(parts), node.to_html())
+        self.assertEqual(
+            node.to_html(), '<ul class="list"><li><b>one</b></li><li>two</li></ul>'
+        )
+
+    def test_render_into_stream(self):
+        # Given: A ParentNode and a text stream
+        import io
+
+        node = ParentNode("p", [LeafNode(None, "a"), LeafNode("i", "b")])
+        stream = io.StringIO()
+
+        # When: Rendering straight into the stream's write method
+        node.render_into(stream.write)
+
+        # Then: The stream holds the full HTML
+        self.assertEqual(stream.getvalue(), "<p>a<i>b</i></p>")
+
+    def test_iter_html(self):
+        # Given: A nested ParentNode
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "text")])])
+
+        # When: Iterating over its HTML fragments
+        parts = list(node.iter_html())
+
+        # Then: They come out in document order
+        self.assertEqual(parts, ["<div>", "<p>", "text", "</p>", "</div>"])
+
+    def test_text_content(self):
+        # Given: A paragraph with inline markup
+        node = ParentNode(
+            "p", [LeafNode(None, "a "), LeafNode("b", "bold"), LeafNode(None, " word")]
+        )
+
+        # Then: Its text has the tags left out
+        self.assertEqual(node.text_content(), "a bold word")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+from precompress import (
+    PrecompressResult,
+    compress_file,
+    precompress_tree,
+    remove_precompressed,
+)
+
+PAGE = "<p>" + "All that is gold does not glitter. " * 40 + "</p>"
+
+
+class TestPrecompressTree(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.manifest = os.path.join(self.tmp.name, "precompress.json")
+        self.page = os.path.join(self.docs, "blog", "index.html")
+        self.write(self.page, PAGE)
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def run_precompress(self):
+        return precompress_tree(self.docs, self.manifest)
+
+    def test_writes_gzip_sibling(self):
+        result = self.run_precompress()
+        self.assertEqual(result.compressed, 1)
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), PAGE)
+        self.assertEqual(
+            os.stat(self.page + ".gz").st_mtime_ns, os.stat(self.page).st_mtime_ns
+        )
+
+    def test_up_to_date_siblings_are_skipped(self):
+        self.run_precompress()
+        self.assertEqual(self.run_precompress(), PrecompressResult(0, 1, 0, 0))
+
+    def test_changed_source_is_recompressed(self):
+        self.run_precompress()
+        self.write(self.page, PAGE + "<p>Not all those who wander are lost.</p>")
+        os.utime(self.page, ns=(0, os.stat(self.page + ".gz").st_mtime_ns + 1))
+        self.assertEqual(self.run_precompress().compressed, 1)
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertIn("wander", f.read())
+
+    def test_skips_compressed_formats_and_tiny_files(self):
+        image = os.path.join(self.docs, "images", "a.png")
+        tiny = os.path.join(self.docs, "tiny.css")
+        self.write(image, "x" * 4096)
+        self.write(tiny, "body {}")
+        self.run_precompress()
+        self.assertFalse(os.path.exists(image + ".gz"))
+        self.assertFalse(os.path.exists(tiny + ".gz"))
+
+    def test_incompressible_file_gets_no_sibling(self):
+        noise = os.path.join(self.docs, "noise.txt")
+        with open(noise, "wb") as f:
+            f.write(os.urandom(4096))
+        mtime_ns = os.stat(noise).st_mtime_ns
+        self.assertEqual(compress_file(noise), (0, [], {noise + ".gz": mtime_ns}))
+        self.assertFalse(os.path.exists(noise + ".gz"))
+
+    def test_incompressible_file_is_not_tried_again(self):
+        noise = os.path.join(self.docs, "noise.bin")
+        with open(noise, "wb") as f:
+            f.write(os.urandom(4096))
+        first = self.run_precompress()
+        self.assertEqual(
+            (first.compressed, first.up_to_date, first.not_smaller), (1, 0, 1)
+        )
+        with mock.patch.dict("precompress.ENCODINGS") as encodings:
+            encodings[".gz"] = mock.Mock(side_effect=encodings[".gz"])
+            self.assertEqual(self.run_precompress(), PrecompressResult(0, 2, 0, 0))
+            encodings[".gz"].assert_not_called()
+        with open(noise, "ab") as f:
+            f.write(b"more")
+        self.assertEqual(self.run_precompress(), PrecompressResult(0, 1, 0, 0, 1))
+        self.assertFalse(os.path.exists(noise + ".gz"))
+
+    def test_removes_siblings_of_removed_files(self):
+        user_archive = os.path.join(self.docs, "downloads", "notes.txt.gz")
+        self.write(user_archive, "not ours")
+        self.run_precompress()
+        os.remove(self.page)
+        result = self.run_precompress()
+        self.assertEqual(result.removed, 1)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+        self.assertTrue(os.path.exists(user_archive))
+
+    def test_remove_precompressed(self):
+        user_archive = os.path.join(self.docs, "downloads", "notes.txt.gz")
+        self.write(user_archive, "not ours")
+        self.run_precompress()
+        self.assertEqual(remove_precompressed(self.docs, self.manifest), 1)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+        self.assertTrue(os.path.exists(user_archive))
+        self.assertEqual(remove_precompressed(self.docs, self.manifest), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+import htmlnode
+import image_variants
+import page_generator
+import static_sync
+from page_generator import generate_pages_recursive
+from precompress import precompress_tree
+from profiler import BuildProfiler
+
+
+class TestBuildProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.dest = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, "{{ Title }}{{ Content }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nSome **text**")
+        self.write(os.path.join(self.content, "a", "index.md"), "# A\n\n- _one_")
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def test_records_stages_pages_and_bytes(self):
+        profiler = BuildProfiler()
+        profiler.install()
+        try:
+            generate_pages_recursive(self.content, self.template, self.dest, "/")
+        finally:
+            profiler.uninstall()
+
+        self.assertEqual(profiler.calls["generate_page"], 2)
+        self.assertEqual(profiler.calls["markdown_to_html_node"], 2)
+        self.assertGreaterEqual(profiler.calls["text_to_textnodes"], 2)
+        self.assertEqual(len(profiler.pages), 2)
+        self.assertGreater(profiler.bytes_read, 0)
+        self.assertGreater(profiler.bytes_written, 0)
+        self.assertIn("slowest 2 pages", profiler.report())
+
+    def test_unchanged_pages_and_links_write_no_bytes(self):
+        generate_pages_recursive(self.content, self.template, self.dest, "/")
+        static = os.path.join(self.tmp.name, "static")
+        self.write(os.path.join(static, "index.css"), "body {}")
+        profiler = BuildProfiler()
+        profiler.install()
+        try:
+            generate_pages_recursive(self.content, self.template, self.dest, "/")
+            static_sync.sync_static_files(static, self.dest, link=True)
+        finally:
+            profiler.uninstall()
+
+        self.assertEqual(profiler.calls["generate_page"], 2)
+        self.assertEqual(profiler.bytes_written, 0)
+
+    def test_counts_site_index_and_precompressed_outputs(self):
+        for name in ("index.md", os.path.join("a", "index.md")):
+            # Long enough to be worth compressing
+            with open(os.path.join(self.content, name), "a") as f:
+                f.write("\n\n" + "Some more text. " * 40)
+        profiler = BuildProfiler()
+        profiler.install()
+        try:
+            generate_pages_recursive(
+                self.content,
+                self.template,
+                self.dest,
+                "/",
+                os.path.join(self.tmp.name, "pages.json"),
+                site_url="https://example.com",
+            )
+            precompressed = precompress_tree(self.dest)
+        finally:
+            profiler.uninstall()
+
+        self.assertGreater(precompressed.compressed, 0)
+        # Everything in dest was written during the build
+        outputs = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(self.dest)
+            for name in files
+        )
+        self.assertEqual(profiler.bytes_written, outputs)
+
+    def test_uninstall_restores_originals(self):
+        write_page = page_generator.write_page
+        copy_file = image_variants.copy_file
+        profiler = BuildProfiler()
+        profiler.install()
+        self.assertIsNot(page_generator.write_page, write_page)
+        self.assertIsNot(image_variants.copy_file, copy_file)
+        profiler.uninstall()
+        self.assertIs(page_generator.write_page, write_page)
+        self.assertIs(image_variants.copy_file, copy_file)
+        self.assertNotIn("to_html", vars(htmlnode.ParentNode))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import render_cache
+from render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache = RenderCache(self.tmp.name)
+
+    def test_put_and_get(self):
+        key = self.cache.key("# Title", "/")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, "Title", "<div><h1>Title</h1><p>Hi</p></div>", "Hi")
+        self.assertEqual(
+            self.cache.get(key), ("Title", "<div><h1>Title</h1><p>Hi</p></div>", "Hi")
+        )
+
+    def test_key_depends_on_basepath_and_parser_version(self):
+        key = self.cache.key("# Title", "/")
+        self.assertNotEqual(key, self.cache.key("# Title", "/ssg/"))
+        newer = render_cache.PARSER_VERSION + 1
+        with mock.patch.object(render_cache, "PARSER_VERSION", newer):
+            self.assertNotEqual(key, self.cache.key("# Title", "/"))
+
+    def test_key_depends_on_asset_names(self):
+        key = self.cache.key("# Title", "/")
+        self.assertEqual(key, self.cache.key("# Title", "/", ""))
+        self.assertNotEqual(key, self.cache.key("# Title", "/", "0123456789abcdef"))
+
+    def test_prune_evicts_least_recently_used(self):
+        keys = [self.cache.key(str(i), "/") for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, "t", "x" * 100)
+            path = self.cache._path(key)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        size = os.path.getsize(self.cache._path(keys[0]))
+
+        self.cache.max_bytes = 2 * size
+        self.cache.prune()
+
+        self.assertIsNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
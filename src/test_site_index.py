@@ -0,0 +1,39 @@
+import os
+import unittest
+from site_index import page_url, render_feed, render_sitemap
+
+
+class TestSiteIndex(unittest.TestCase):
+    def setUp(self):
+        self.pages = [
+            {"url": "/ssg/", "title": "Home", "summary": "Hi & welcome", "mtime": 0},
+            {"url": "/ssg/blog/", "title": "<Blog>", "summary": "", "mtime": 86400},
+        ]
+
+    def test_page_url(self):
+        home = os.path.join("docs", "index.html")
+        post = os.path.join("docs", "blog", "tom", "index.html")
+        self.assertEqual(page_url(home, "docs", "/"), "/")
+        self.assertEqual(page_url(post, "docs", "/ssg/"), "/ssg/blog/tom/")
+
+    def test_sitemap_has_absolute_urls(self):
+        sitemap = render_sitemap(self.pages, "https://example.com")
+        self.assertIn(
+            "<url><loc>https://example.com/ssg/blog/</loc>"
+            "<lastmod>1970-01-02</lastmod></url>",
+            sitemap,
+        )
+
+    def test_feed_lists_newest_first_and_escapes_text(self):
+        feed = render_feed(self.pages, "https://example.com")
+        channel, *items = feed.split("<item>")
+        self.assertIn("<title>Home</title>", channel)
+        self.assertIn("<link>https://example.com/ssg/</link>", channel)
+        self.assertIn("<description>Hi &amp; welcome</description>", channel)
+        self.assertEqual(len(items), 2)
+        self.assertIn("<title>&lt;Blog&gt;</title>", items[0])
+        self.assertIn("<pubDate>Fri, 02 Jan 1970 00:00:00 GMT</pubDate>", feed)
+
+
+if __name__ == "__main__":
+    unittest.main()
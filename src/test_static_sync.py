@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from static_sync import (
+    ASSET_MANIFEST_NAME,
+    SyncResult,
+    copy_file,
+    fingerprint_name,
+    sync_static_files,
+)
+
+
+class TestSyncStaticFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.src = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        self.manifest = os.path.join(self.tmp.name, "static.json")
+        self.write(os.path.join(self.src, "index.css"), "body {}")
+        self.write(os.path.join(self.src, "images", "a.png"), "png")
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def sync(self, use_hash=False, link=False, fingerprint=False):
+        return sync_static_files(
+            self.src,
+            self.dest,
+            self.manifest,
+            use_hash=use_hash,
+            link=link,
+            fingerprint=fingerprint,
+        )
+
+    def test_copies_new_files(self):
+        self.sync()
+        self.assertEqual(self.read(os.path.join(self.dest, "index.css")), "body {}")
+        self.assertEqual(self.read(os.path.join(self.dest, "images", "a.png")), "png")
+
+    def test_leaves_generated_files_alone(self):
+        page = os.path.join(self.dest, "index.html")
+        self.write(page, "<html></html>")
+        self.sync()
+        self.sync()
+        self.assertEqual(self.read(page), "<html></html>")
+
+    def test_unchanged_files_are_not_copied(self):
+        self.sync()
+        css = os.path.join(self.dest, "index.css")
+        stat = os.stat(css)
+        # Same size and mtime as the source, so a sync must not notice this
+        self.write(css, "BODY {}")
+        os.utime(css, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.sync()
+        self.assertEqual(self.read(css), "BODY {}")
+        self.sync(use_hash=True)
+        self.assertEqual(self.read(css), "body {}")
+
+    def test_changed_files_are_copied(self):
+        self.sync()
+        self.write(os.path.join(self.src, "index.css"), "body { margin: 0 }")
+        self.sync()
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "index.css")), "body { margin: 0 }"
+        )
+
+    def test_removed_files_are_deleted(self):
+        self.sync()
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        self.sync()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.css")))
+
+    def test_reports_what_it_did(self):
+        self.assertEqual(self.sync(), SyncResult(2, 0, 0, 10))
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        self.assertEqual(self.sync(), SyncResult(0, 1, 1, 0))
+
+    def test_link_mode_hard_links_files(self):
+        self.assertEqual(self.sync(link=True), SyncResult(2, 0, 0, 0))
+        src_css = os.path.join(self.src, "index.css")
+        self.assertTrue(os.path.samefile(src_css, os.path.join(self.dest, "index.css")))
+        self.assertEqual(self.sync(link=True), SyncResult(0, 2, 0, 0))
+
+    def test_link_mode_falls_back_to_copying(self):
+        with mock.patch("os.link", side_effect=OSError("cross-device link")):
+            self.assertEqual(self.sync(link=True), SyncResult(2, 0, 0, 10))
+        dest_css = os.path.join(self.dest, "index.css")
+        src_css = os.path.join(self.src, "index.css")
+        self.assertFalse(os.path.samefile(src_css, dest_css))
+        self.assertEqual(self.read(dest_css), "body {}")
+
+    def test_copying_over_a_link_leaves_the_source_alone(self):
+        self.sync(link=True)
+        src_css = os.path.join(self.src, "index.css")
+        dest_css = os.path.join(self.dest, "index.css")
+        # As the watcher does when the linked source is edited in place
+        self.assertEqual(copy_file(src_css, dest_css), 7)
+        self.assertEqual(self.read(src_css), "body {}")
+        self.assertEqual(self.read(dest_css), "body {}")
+        self.assertFalse(os.path.samefile(src_css, dest_css))
+
+    def test_fingerprint_names_assets_by_content(self):
+        self.write(os.path.join(self.src, "robots.txt"), "User-agent: *")
+        assets = self.sync(fingerprint=True).assets
+        css = assets["/index.css"]
+        self.assertRegex(css, r"^/index\.[0-9a-f]{10}\.css$")
+        self.assertEqual(self.read(os.path.join(self.dest, css[1:])), "body {}")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css")))
+        self.assertNotIn("/robots.txt", assets)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "robots.txt")))
+        with open(os.path.join(self.dest, ASSET_MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f), assets)
+
+    def test_only_changed_assets_get_new_names(self):
+        first = self.sync(fingerprint=True).assets
+        self.write(os.path.join(self.src, "index.css"), "body { margin: 0 }")
+        second = self.sync(fingerprint=True).assets
+        self.assertNotEqual(first["/index.css"], second["/index.css"])
+        self.assertEqual(first["/images/a.png"], second["/images/a.png"])
+        old_css = os.path.join(self.dest, first["/index.css"][1:])
+        self.assertFalse(os.path.exists(old_css))
+
+    def test_unchanged_assets_are_not_hashed_again(self):
+        self.sync(fingerprint=True)
+        with mock.patch("static_sync.hash_file") as hash_file:
+            result = self.sync(fingerprint=True)
+        hash_file.assert_not_called()
+        self.assertEqual(result.skipped, 2)
+
+    def test_turning_fingerprinting_off_restores_plain_names(self):
+        assets = self.sync(fingerprint=True).assets
+        self.assertIsNone(self.sync().assets)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.css")))
+        old_css = os.path.join(self.dest, assets["/index.css"][1:])
+        self.assertFalse(os.path.exists(old_css))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, ASSET_MANIFEST_NAME)))
+
+    def test_fingerprint_name(self):
+        self.assertEqual(
+            fingerprint_name(os.path.join("img", "a.b.png"), "0123456789abcdef"),
+            os.path.join("img", "a.b.0123456789.png"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
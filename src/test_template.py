@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from htmlnode import LeafNode, ParentNode
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_fills_placeholders(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(
+            template.render("Home", "<p>hi</p>"),
+            "<title>Home</title><main><p>hi</p></main>",
+        )
+
+    def test_repeated_placeholders(self):
+        template = Template("{{ Title }}|{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render("T", "C"), "T|T|C")
+
+    def test_basepath_rewrites_template_literals(self):
+        template = Template(
+            '<link href="/index.css"><img src="/a.png">{{ Content }}', basepath="/ssg/"
+        )
+        self.assertEqual(
+            template.render("", ""),
+            '<link href="/ssg/index.css"><img src="/ssg/a.png">',
+        )
+
+    def test_asset_urls_are_fingerprinted(self):
+        template = Template(
+            '<link href="/index.css"><a href="/index.css.map">{{ Content }}',
+            basepath="/ssg/",
+            assets={"/index.css": "/index.0123456789.css"},
+        )
+        self.assertEqual(
+            template.render("", ""),
+            '<link href="/ssg/index.0123456789.css"><a href="/ssg/index.css.map">',
+        )
+
+    def test_content_is_not_rewritten(self):
+        template = Template("{{ Content }}", basepath="/ssg/")
+        self.assertEqual(template.render("", '<a href="/x">'), '<a href="/x">')
+
+    def test_render_into_with_node_content(self):
+        template = Template("<h1>{{ Title }}</h1>{{ Content }}")
+        parts = []
+        template.render_into(parts.append, "T", ParentNode("p", [LeafNode(None, "x")]))
+        self.assertEqual("".join(parts), "<h1>T</h1><p>x</p>")
+
+    def test_render_into_matches_render(self):
+        template = Template("a{{ Content }}b{{ Title }}c")
+        parts = []
+        template.render_into(parts.append, "T", "C")
+        self.assertEqual("".join(parts), template.render("T", "C"))
+
+    def test_minify_strips_template_but_not_content(self):
+        template = Template(
+            "<body>\n  <!-- page -->\n  <main>\n    {{ Content }}\n  </main>\n</body>",
+            minify=True,
+        )
+        self.assertEqual(
+            template.render("", "<pre>a\n  b</pre>"),
+            "<body><main><pre>a\n  b</pre></main></body>",
+        )
+
+
+
+class TestTemplateIncludes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+
+    def write(self, rel_path, text):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_partials_are_inlined_relative_to_the_includer(self):
+        path = self.write("page.html", "{{ Include partials/head.html }}{{ Content }}")
+        self.write("partials/head.html", "<h>{{ Include nav.html }}</h>")
+        self.write("partials/nav.html", '<a href="/">{{ Title }}</a>')
+        template = Template.load(path, basepath="/ssg/")
+        self.assertEqual(
+            template.render("T", "C"), '<h><a href="/ssg/">T</a></h>C'
+        )
+        self.assertEqual(
+            template.dependencies,
+            [
+                path,
+                os.path.join(self.root, "partials", "head.html"),
+                os.path.join(self.root, "partials", "nav.html"),
+            ],
+        )
+
+    def test_include_cycles_are_reported(self):
+        path = self.write("a.html", "{{ Include b.html }}")
+        self.write("b.html", "{{ Include a.html }}")
+        with self.assertRaisesRegex(ValueError, "include cycle"):
+            Template.load(path)
+
+    def test_missing_partial(self):
+        path = self.write("a.html", "{{ Include missing.html }}")
+        with self.assertRaises(FileNotFoundError):
+            Template.load(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
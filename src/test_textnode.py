@@ -71,5 +71,14 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(node.text_type, TextType.IMAGE)
 
 
+    def test_textnode_is_slotted(self):
+        # Given: A TextNode
+        node = TextNode("hello", TextType.TEXT)
+        # Then: It has no per-instance __dict__ and rejects unknown attributes
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = "nope"
+
+
 if __name__ == "__main__":
     unittest.main()
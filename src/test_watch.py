@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import unittest
+import urllib.request
+from watch import SiteWatcher, serve_directory
+
+
+class TestSiteWatcher(unittest.TestCase):
+    use_inotify = True
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.dest = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        self.write(self.template, "{{ Title }}")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.watcher = SiteWatcher(
+            self.content,
+            self.static,
+            self.template,
+            self.dest,
+            "/",
+            use_inotify=self.use_inotify,
+        )
+        self.addCleanup(self.watcher.close)
+
+    def write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_nothing_changed(self):
+        self.assertEqual(self.watcher.poll(), 0)
+
+    def test_changed_page_is_rendered_alone(self):
+        self.write(os.path.join(self.content, "blog", "index.md"), "# News!")
+        self.assertEqual(self.watcher.poll(), 1)
+        self.assertEqual(self.read(os.path.join(self.dest, "blog", "index.html")), "News!")
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_template_change_renders_every_page(self):
+        self.write(self.template, "[{{ Title }}]")
+        self.assertEqual(self.watcher.poll(), 2)
+        self.assertEqual(self.read(os.path.join(self.dest, "index.html")), "[Home]")
+
+    def test_partial_change_renders_only_its_dependents(self):
+        blog_template = os.path.join(self.content, "blog", "template.html")
+        self.write(os.path.join(self.tmp.name, "nav.html"), "nav")
+        self.write(blog_template, "{{ Title }}+{{ Include ../../nav.html }}")
+        # A new directory template re-renders everything
+        self.assertEqual(self.watcher.poll(), 2)
+        self.write(os.path.join(self.tmp.name, "nav.html"), "menu")
+        self.assertEqual(self.watcher.poll(), 1)
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "blog", "index.html")), "Blog+menu"
+        )
+
+    def test_missing_partial_is_picked_up_once_created(self):
+        nav = os.path.join(self.tmp.name, "nav.html")
+        self.write(self.template, "{{ Title }}+{{ Include nav.html }}")
+        with self.assertLogs("ssg", "ERROR"):
+            self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html")))
+        self.write(nav, "menu")
+        self.assertEqual(self.watcher.poll(), 2)
+        self.assertEqual(self.read(os.path.join(self.dest, "index.html")), "Home+menu")
+        self.write(self.template, "{{ Title }}-{{ Include nav.html }}")
+        self.assertEqual(self.watcher.poll(), 2)
+        self.assertEqual(self.read(os.path.join(self.dest, "index.html")), "Home-menu")
+
+    def test_static_changes_are_mirrored(self):
+        self.write(os.path.join(self.static, "images", "a.png"), "png")
+        self.watcher.poll()
+        self.assertEqual(self.read(os.path.join(self.dest, "images", "a.png")), "png")
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+
+    def test_deleted_page_removes_output(self):
+        blog_md = os.path.join(self.content, "blog", "index.md")
+        self.write(blog_md, "# Blog!")
+        self.watcher.poll()
+        os.remove(blog_md)
+        self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+
+    def test_new_directory_is_rendered(self):
+        self.write(os.path.join(self.content, "a", "b", "index.md"), "# Deep")
+        self.assertEqual(self.watcher.poll(), 1)
+        self.write(os.path.join(self.content, "a", "b", "index.md"), "# Deeper")
+        self.assertEqual(self.watcher.poll(), 1)
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "a", "b", "index.html")), "Deeper"
+        )
+
+    def test_moved_directory_moves_its_pages(self):
+        os.rename(
+            os.path.join(self.content, "blog"), os.path.join(self.content, "news")
+        )
+        self.assertEqual(self.watcher.poll(), 2)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        self.assertEqual(
+            self.read(os.path.join(self.dest, "news", "index.html")), "Blog"
+        )
+        shutil.rmtree(os.path.join(self.content, "news"))
+        self.assertEqual(self.watcher.poll(), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "news")))
+
+
+class TestSiteWatcherPolling(TestSiteWatcher):
+    use_inotify = False
+
+
+class TestServeDirectory(unittest.TestCase):
+    def test_serves_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "index.html"), "w") as f:
+                f.write("hello")
+            server = serve_directory(tmp, port=0)
+            self.addCleanup(server.server_close)
+            self.addCleanup(server.shutdown)
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/") as response:
+                self.assertEqual(response.read(), b"hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
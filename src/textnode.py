@@ -42,6 +42,8 @@ class TextNode:
         __repr__(): Developer-friendly string representation of the node.
     """
 
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(
         self, text: str, text_type: TextType, url: Optional[str] = None
     ) -> None:
@@ -0,0 +1,297 @@
+import functools
+import os
+import select
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from build_log import event, logger
+from fs_events import tree_events
+from fs_utils import remove_empty_parents
+from page_generator import TEMPLATE_NAME, find_template, page_dest_path, write_page
+from static_sync import copy_file
+from template import Template, expand_includes
+
+
+def snapshot_tree(root: str) -> dict[str, tuple[int, int]]:
+    """Map every file under root to its (mtime_ns, size)."""
+    files = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def diff_snapshots(old: dict, new: dict) -> tuple[list[str], list[str]]:
+    """Return (changed or added paths, removed paths) between two snapshots."""
+    changed = [path for path, stamp in new.items() if old.get(path) != stamp]
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+
+def update_snapshot(snapshot: dict, paths) -> tuple[list[str], list[str]]:
+    """
+    Look again at just the given files and directories, bring snapshot up
+    to date with them and return (changed or added paths, removed paths).
+    """
+    changed, removed = [], []
+    for path in paths:
+        stamp = _stamp(path)
+        if os.path.isdir(path):
+            old = _under(snapshot, path)
+            new = snapshot_tree(path)
+        elif path in snapshot or stamp is not None:
+            old = {path: snapshot[path]} if path in snapshot else {}
+            new = {} if stamp is None else {path: stamp}
+        else:
+            # Gone: a directory that was deleted or moved away (or a file
+            # that came and went between two looks)
+            old = _under(snapshot, path)
+            new = {}
+        path_changed, path_removed = diff_snapshots(old, new)
+        for removed_path in path_removed:
+            del snapshot[removed_path]
+        snapshot.update(new)
+        changed.extend(path_changed)
+        removed.extend(path_removed)
+    return changed, removed
+
+
+def _under(snapshot: dict, directory: str) -> dict:
+    prefix = directory + os.sep
+    return {path: stamp for path, stamp in snapshot.items() if path.startswith(prefix)}
+
+
+class SiteWatcher:
+    """
+    Watches the content and static directories and the templates, and
+    applies each change to dest_dir directly: an edited page is re-rendered,
+    an edited asset is copied, and deleted files lose their outputs. A
+    change to a template or one of its partials re-renders the pages that
+    use that template (cheap with a RenderCache).
+
+    On Linux the kernel reports what changed under content_dir and
+    static_dir (inotify), so only those paths are looked at again; elsewhere,
+    or with use_inotify off, every poll walks both trees.
+
+    The build manifests are not updated while watching; run a normal
+    build afterwards to bring them up to date.
+    """
+
+    def __init__(
+        self,
+        content_dir,
+        static_dir,
+        template_path,
+        dest_dir,
+        basepath,
+        cache=None,
+        link_static=False,
+        minify=False,
+        use_inotify=True,
+    ) -> None:
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.cache = cache
+        self.link_static = link_static
+        self.minify = minify
+        # template path -> Template, loaded when a page first needs it
+        self.templates = {}
+        # template path -> the files it was (or failed to be) loaded from
+        self.template_dependencies = {}
+        self.dependency_stamps = {}
+        # Watch before taking the snapshots so that nothing falls in between
+        self.events = tree_events([content_dir, static_dir]) if use_inotify else None
+        self.content = snapshot_tree(content_dir)
+        self.static = snapshot_tree(static_dir)
+        # Load the templates in use now so that edits to them are noticed
+        for path in self.content:
+            if path.endswith(".md"):
+                self._template_for(path)
+
+    def _template_for(self, from_path) -> Template:
+        path = find_template(from_path, self.content_dir, self.template_path)
+        template = self.templates.get(path)
+        if template is None:
+            dependencies = [path]
+            try:
+                text = expand_includes(path, dependencies, ())
+            finally:
+                # Stamp what was read even if loading failed (say, on a
+                # partial that does not exist yet), so that fixing it is
+                # noticed
+                self.template_dependencies[path] = dependencies
+                for dependency in dependencies:
+                    self.dependency_stamps[dependency] = _stamp(dependency)
+            template = Template(text, self.basepath, path, dependencies, self.minify)
+            self.templates[path] = template
+        return template
+
+    def _outdated_templates(self) -> set[str]:
+        """Forget templates whose files changed and return their paths."""
+        changed = {
+            path
+            for path, stamp in self.dependency_stamps.items()
+            if _stamp(path) != stamp
+        }
+        if not changed:
+            return set()
+        outdated = {
+            path
+            for path, dependencies in self.template_dependencies.items()
+            if changed.intersection(dependencies)
+        }
+        for path in outdated:
+            self.templates.pop(path, None)
+            del self.template_dependencies[path]
+        for path in changed:
+            del self.dependency_stamps[path]
+        return outdated
+
+    def _static_dest(self, path) -> str:
+        return os.path.join(self.dest_dir, os.path.relpath(path, self.static_dir))
+
+    def _render(self, from_path) -> None:
+        dest_path = page_dest_path(from_path, self.content_dir, self.dest_dir)
+        try:
+            write_page(from_path, self._template_for(from_path), dest_path, self.cache)
+        except Exception as e:
+            # Keep watching; the next save will usually fix it
+            logger.error(
+                f"Failed to generate page from {from_path}: {e}",
+                extra=event("page_failed", source=from_path),
+            )
+
+    def poll(self) -> int:
+        """Apply any changes since the last poll and return how many there were."""
+        updates = 0
+        paths = self.events.read() if self.events is not None else None
+
+        changed, removed = _tree_changes(self.content, self.content_dir, paths)
+
+        if any(
+            os.path.basename(path) == TEMPLATE_NAME for path in changed + removed
+        ):
+            # A directory template appeared or went away: pages may have
+            # switched templates, so start over with every page
+            self.templates.clear()
+            self.template_dependencies.clear()
+            self.dependency_stamps.clear()
+            changed = list(self.content)
+        else:
+            outdated = self._outdated_templates()
+            if outdated:
+                changed = set(changed)
+                changed.update(
+                    path
+                    for path in self.content
+                    if path.endswith(".md")
+                    and find_template(path, self.content_dir, self.template_path)
+                    in outdated
+                )
+
+        for path in changed:
+            if path.endswith(".md"):
+                self._render(path)
+                updates += 1
+        for path in removed:
+            if path.endswith(".md"):
+                dest_path = page_dest_path(path, self.content_dir, self.dest_dir)
+                if os.path.exists(dest_path):
+                    os.remove(dest_path)
+                remove_empty_parents(dest_path, self.dest_dir)
+                updates += 1
+
+        changed, removed = _tree_changes(self.static, self.static_dir, paths)
+        for path in changed:
+            copy_file(path, self._static_dest(path), self.link_static)
+            updates += 1
+        for path in removed:
+            dst_path = self._static_dest(path)
+            if os.path.exists(dst_path):
+                os.remove(dst_path)
+                logger.info(
+                    f"Removed: {dst_path}", extra=event("file_removed", dest=dst_path)
+                )
+            remove_empty_parents(dst_path, self.dest_dir)
+            updates += 1
+
+        return updates
+
+    def run(self, interval: float = 0.05, stop: threading.Event | None = None) -> None:
+        """
+        Apply changes as they happen until stop is set (or forever). With
+        inotify a change under the content or static directory is picked up
+        at once, and interval only bounds how long a template edit goes
+        unnoticed. Without it the trees are polled every interval seconds,
+        but never for more than a third of the time, however large they are.
+        """
+        stop = stop or threading.Event()
+        logger.info(
+            f"Watching {self.content_dir}, {self.static_dir}, {self.template_path}"
+        )
+        wait = interval
+        while not stop.is_set():
+            if self.events is not None:
+                select.select([self.events], [], [], interval)
+            elif stop.wait(wait):
+                break
+            start = time.perf_counter()
+            updates = self.poll()
+            elapsed = time.perf_counter() - start
+            if self.events is None:
+                wait = max(interval, 2 * elapsed)
+            if updates:
+                logger.info(
+                    f"Rebuilt {updates} file(s) in {elapsed * 1000:.0f} ms",
+                    extra=event("rebuilt", files=updates, elapsed_ms=elapsed * 1000),
+                )
+
+    def close(self) -> None:
+        """Stop watching with inotify; poll() walks the trees from then on."""
+        if self.events is not None:
+            self.events.close()
+            self.events = None
+
+
+def _tree_changes(snapshot: dict, root: str, paths) -> tuple[list[str], list[str]]:
+    # Bring the snapshot of root up to date, by walking root again when
+    # paths is None and by looking at just those under root otherwise
+    if paths is None:
+        new = snapshot_tree(root)
+        changed, removed = diff_snapshots(snapshot, new)
+        snapshot.clear()
+        snapshot.update(new)
+        return changed, removed
+    prefix = os.path.join(root, "")
+    return update_snapshot(snapshot, [p for p in paths if p.startswith(prefix)])
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def serve_directory(directory: str, port: int = 8888) -> ThreadingHTTPServer:
+    """Serve directory over HTTP from a background thread and return the server."""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server